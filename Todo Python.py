@@ -1,61 +1,3255 @@
-import customtkinter as ctk
-import tkinter as tk
+import bisect
+import codecs
+import collections
+import contextlib
+import functools
+import itertools
 import json
+import mmap
 import os
-import uuid
-import hashlib
+import queue
+import re
+import select
+import struct
 import sys
 from datetime import datetime
 import threading
 import time
-import urllib
-import urllib.request
 
-UPDATE_URL = "https://raw.githubusercontent.com/SosoTlm/todo-python/refs/heads/main/Todo%20Python.py"
+# Modules only some commands or dialogs need (argparse, csv, gzip, hashlib,
+# sqlite3, urllib, uuid...) are imported where they are used, so starting the
+# window does not pay for them. Importing this file has no side effects: the
+# update check, the loader and the sync thread are all started by the app.
+
+UPDATE_URL = "https://raw.githubusercontent.com/SosoTlm/todo-python/refs/heads/main/Todo%20Python.py"
+UPDATE_TIMEOUT_SECONDS = 5
+UPDATE_CACHE_FILE = "update_cache.json"
+
+def read_json_file(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+# Fonction pour calculer le hash SHA256 du fichier donné
+# Le hash est mis en cache tant que la date de modification du fichier ne change pas
+def file_hash(filepath, cache=None):
+    if not os.path.exists(filepath):
+        return None
+    stat = os.stat(filepath)
+    key = [stat.st_mtime_ns, stat.st_size]
+    if cache is not None and cache.get("local_stat") == key:
+        return cache["local_hash"]
+    import hashlib
+
+    with open(filepath, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    if cache is not None:
+        cache["local_stat"] = key
+        cache["local_hash"] = digest
+    return digest
+
+# Fonction principale de mise à jour, exécutée en arrière-plan
+def check_for_update(url=UPDATE_URL, local_file=None, cache_file=UPDATE_CACHE_FILE, timeout=UPDATE_TIMEOUT_SECONDS):
+    import hashlib
+    import urllib.error
+    import urllib.request
+
+    local_file = local_file or os.path.realpath(__file__)
+    tmp_path = local_file + ".download"
+    deadline = time.monotonic() + timeout
+    cache = read_json_file(cache_file, {})
+    try:
+        current_hash = file_hash(local_file, cache)
+        request = urllib.request.Request(url)
+        # Requête conditionnelle : le serveur répond 304 si rien n'a changé
+        if cache.get("remote_hash") == current_hash:
+            if cache.get("etag"):
+                request.add_header("If-None-Match", cache["etag"])
+            if cache.get("last_modified"):
+                request.add_header("If-Modified-Since", cache["last_modified"])
+
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                digest = hashlib.sha256()
+                with open(tmp_path, "wb") as f:
+                    while chunk := response.read(64 * 1024):
+                        if time.monotonic() > deadline:
+                            raise TimeoutError("délai de téléchargement dépassé")
+                        digest.update(chunk)
+                        f.write(chunk)
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise
+            print("🟢 Aucune mise à jour nécessaire.")
+            return "current"
+
+        latest_hash = digest.hexdigest()
+        cache.update(remote_hash=latest_hash, etag=headers.get("ETag"), last_modified=headers.get("Last-Modified"))
+
+        if latest_hash == current_hash:
+            print("🟢 Aucune mise à jour nécessaire.")
+            return "current"
+
+        # Vérifie le fichier téléchargé avant de remplacer le fichier local
+        with open(tmp_path, "rb") as f:
+            compile(f.read(), local_file, "exec")
+        print("🔁 Mise à jour disponible ! Mise à jour en cours...")
+        os.replace(tmp_path, local_file)
+        file_hash(local_file, cache)
+        print("✅ Mise à jour terminée. Elle sera utilisée au prochain démarrage.")
+        return "updated"
+    except Exception as e:
+        print(f"⚠️ Erreur lors de la vérification des mises à jour : {e}")
+        return "error"
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        try:
+            write_json_atomic(cache_file, cache)
+        except OSError:
+            pass
+
+def start_update_check(**options):
+    def run():
+        with METRICS.span("update_check"):
+            check_for_update(**options)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+# Constants
+DATA_FILE = os.environ.get("TODO_PYTHON_DATA", "tasks.json")
+LEGACY_DATA_FILE = "tasks.json"
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+BINARY_SUFFIXES = (".tpb",)
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+LOCK_SUFFIX = ".lock"
+CHANGE_LOG_KEEP = 50_000
+WATCH_POLL_SECONDS = 1.0
+WATCH_SETTLE_SECONDS = 0.05
+EXTERNAL_POLL_MS = 200
+SAVE_DEBOUNCE_SECONDS = 0.25
+LOAD_BATCH_SIZE = 500
+# Tasks read at most while waiting for every column to have a first batch
+FIRST_BATCHES_SCAN = 20_000
+# Tasks added while the board is still streaming in are numbered from here,
+# loaded tasks keep the store's own order below it
+RUNTIME_SEQ_START = 1 << 53
+STREAM_CHUNK_BYTES = 256 * 1024
+DESCRIPTION_PREVIEW_CHARS = 50
+LOADING_POLL_MS = 10
+SETTINGS_FILE = "settings.json"
+DEFAULT_SETTINGS = {
+    "check_for_updates": True,
+    "collect_metrics": True,
+    "theme": None,
+    "sync_server": None,
+    "archive_after_days": 30,
+    "column_views": {}
+}
+METRICS_WINDOW = 500
+METRICS_FILE = "metrics.json"
+PROFILE_SPANS = ("update_board", "refresh_cards")
+HISTORY_LIMIT = 200
+HISTORY_MAX_CHANGES = 100_000
+# Replayed runs up to this size shift the buckets per task, larger ones rebuild them
+HISTORY_BULK_TASKS = 64
+SYNC_SERVER = os.environ.get("TODO_PYTHON_SYNC")
+SYNC_PORT = 8765
+SYNC_BATCH_SIZE = 500
+SYNC_INTERVAL_SECONDS = 30
+SYNC_TIMEOUT_SECONDS = 10
+SYNC_STATE_SUFFIX = ".sync.json"
+OUTBOX_SUFFIX = ".outbox"
+ARCHIVE_SUFFIX = ".archive"
+ARCHIVE_SEGMENT_TASKS = 1000
+ARCHIVE_SEARCH_LIMIT = 500
+STATUSES = ["Todo", "InProgress", "Done"]
+PRIORITIES = ["Low", "Important", "Urgent"]
+CARD_HEIGHT = 140
+CARD_SPACING = 10
+OVERSCAN_ROWS = 2
+SEARCH_DEBOUNCE_MS = 60
+# A single letter matches most of the board, the search starts at the second
+SEARCH_MIN_TERM = 2
+PRIORITY_COLORS = {
+    "Low": ("#10b981", "#059669"),
+    "Important": ("#f59e0b", "#d97706"),
+    "Urgent": ("#ef4444", "#dc2626")
+}
+
+def write_json_atomic(path, data, **dump_options):
+    # Write next to the target then swap, a crash never leaves a half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, **dump_options)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def file_key(path):
+    # Changes whenever the file is rewritten, replaced or appended to
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+class FileLock:
+    # Advisory lock shared with other processes through a lock file next to the
+    # board. Re-entrant within a process, threads queue on the inner lock.
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.RLock()
+        self.depth = 0
+        self.handle = None
+
+    def __enter__(self):
+        self.local.acquire()
+        if self.depth == 0:
+            try:
+                self.handle = open(self.path, "a+b")
+                if fcntl is not None:
+                    fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX)
+                else:
+                    self.handle.seek(0)
+                    msvcrt.locking(self.handle.fileno(), msvcrt.LK_LOCK, 1)
+            except OSError:
+                if self.handle is not None:
+                    self.handle.close()
+                    self.handle = None
+                self.local.release()
+                raise
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self.depth -= 1
+        if self.depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+            else:
+                self.handle.seek(0)
+                msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+            self.handle.close()
+            self.handle = None
+        self.local.release()
+        return False
+
+def load_settings():
+    settings = read_json_file(SETTINGS_FILE, {})
+    if not isinstance(settings, dict):
+        settings = {}
+    return {**DEFAULT_SETTINGS, **settings}
+
+def save_settings(settings):
+    write_json_atomic(SETTINGS_FILE, settings, indent=2)
+
+class NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_SPAN = NullSpan()
+
+class Span:
+    __slots__ = ("metrics", "name", "start", "profiler", "profile_path")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.profiler = None
+
+    def __enter__(self):
+        if self.metrics.profile_path and self.name in PROFILE_SPANS:
+            self.profiler, self.profile_path = self.metrics.start_profile()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.record(self.name, time.perf_counter() - self.start)
+        if self.profiler is not None:
+            self.metrics.stop_profile(self.profiler, self.profile_path)
+        return False
+
+class Metrics:
+    # Rolling timings of the hot paths: count, p50, p95 and max per span name.
+    # A disabled span is a shared no-op object, so the call sites stay in place.
+    def __init__(self, enabled=True, window=METRICS_WINDOW, profile_path=None):
+        self.enabled = enabled
+        self.window = window
+        self.profile_path = profile_path
+        self.samples = {}
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def span(self, name):
+        if not self.enabled and not self.profile_path:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def record(self, name, seconds):
+        with self.lock:
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = collections.deque(maxlen=self.window)
+            samples.append(seconds)
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def start_profile(self):
+        # Only one refresh is captured, the path is consumed here
+        import cProfile
+        path, self.profile_path = self.profile_path, None
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler, path
+
+    def stop_profile(self, profiler, path):
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"📊 Profile of one refresh written to {path}")
+
+    def summary(self):
+        with self.lock:
+            samples = {name: sorted(values) for name, values in self.samples.items()}
+            counts = dict(self.counts)
+        summary = {}
+        for name in sorted(samples):
+            values = samples[name]
+            summary[name] = {
+                "count": counts[name],
+                "p50_ms": values[len(values) // 2] * 1000,
+                "p95_ms": values[min(len(values) - 1, len(values) * 95 // 100)] * 1000,
+                "max_ms": values[-1] * 1000
+            }
+        return summary
+
+    def export(self, path=METRICS_FILE):
+        write_json_atomic(path, {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "window": self.window,
+            "spans": self.summary()
+        }, indent=2)
+
+# TODO_PYTHON_METRICS=0 turns the timings off, TODO_PYTHON_PROFILE=<file> writes
+# a cProfile capture of the next board refresh
+METRICS = Metrics(
+    enabled=os.environ.get("TODO_PYTHON_METRICS", "1") != "0",
+    profile_path=os.environ.get("TODO_PYTHON_PROFILE")
+)
+
+# Status and priority names are stored once, tasks only keep their index.
+# Names that are not part of the board (hand-edited files) get their own code.
+STATUS_NAMES = list(STATUSES)
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+PRIORITY_NAMES = list(PRIORITIES)
+PRIORITY_CODES = {name: code for code, name in enumerate(PRIORITY_NAMES)}
+ARCHIVE_STATUS = STATUS_CODES["Done"]
+TASK_FIELDS = ("id", "title", "description", "priority", "status", "created_at", "updated_at")
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+def name_code(codes, names, name):
+    code = codes.get(name)
+    if code is None:
+        code = codes[name] = len(names)
+        names.append(name)
+    return code
+
+def parse_timestamp(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+def format_timestamp(timestamp):
+    return "" if timestamp is None else datetime.fromtimestamp(timestamp).isoformat()
+
+def unparsed_timestamps(data):
+    # Timestamps that are not ISO dates, kept as written so saving gives them back
+    return {
+        name: data[name] for name in TIMESTAMP_FIELDS
+        if data.get(name) not in (None, "") and parse_timestamp(data[name]) is None
+    }
+
+class Task:
+    # Compact task record: status and priority are small ints, timestamps are
+    # epoch seconds. The JSON form (to_dict/from_dict) is unchanged.
+    __slots__ = ("id", "title", "_description", "loader", "priority", "status", "created_at", "updated_at", "extra")
+
+    def __init__(self, task_id, title, description="", priority=1, status=0, created_at=None, updated_at=None, extra=None):
+        self.id = task_id
+        self.title = title
+        self._description = description
+        self.loader = None
+        self.priority = priority
+        self.status = status
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data, loader=None):
+        extra = {key: value for key, value in data.items() if key not in TASK_FIELDS}
+        created_at = parse_timestamp(data.get("created_at"))
+        updated_at = parse_timestamp(data.get("updated_at"))
+        if created_at is None or updated_at is None:
+            extra.update(unparsed_timestamps(data))
+        task = cls(
+            data["id"],
+            data.get("title", ""),
+            data.get("description", ""),
+            name_code(PRIORITY_CODES, PRIORITY_NAMES, data.get("priority", PRIORITIES[0])),
+            name_code(STATUS_CODES, STATUS_NAMES, data.get("status", STATUSES[0])),
+            created_at,
+            updated_at,
+            extra or None
+        )
+        # Long descriptions stay in the store, only the card preview is kept
+        if loader is not None and len(task._description) > DESCRIPTION_PREVIEW_CHARS:
+            task._description = task.preview
+            task.loader = loader
+        return task
+
+    @staticmethod
+    def fields_from_dict(data):
+        # Attribute values for the JSON fields present in data, id excluded
+        fields = {}
+        for name, value in data.items():
+            if name in ("title", "description"):
+                fields[name] = value
+            elif name == "priority":
+                fields[name] = name_code(PRIORITY_CODES, PRIORITY_NAMES, value)
+            elif name == "status":
+                fields[name] = name_code(STATUS_CODES, STATUS_NAMES, value)
+            elif name in ("created_at", "updated_at"):
+                fields[name] = parse_timestamp(value)
+        return fields
+
+    def to_dict(self):
+        data = {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "priority": PRIORITY_NAMES[self.priority],
+            "status": STATUS_NAMES[self.status],
+            "created_at": format_timestamp(self.created_at),
+            "updated_at": format_timestamp(self.updated_at)
+        }
+        if self.extra:
+            for name, value in self.extra.items():
+                # An unparsed timestamp stands in only until a real one is set
+                if data.get(name, "") == "":
+                    data[name] = value
+        return data
+
+    @property
+    def description(self):
+        if self.loader is not None:
+            self._description = self.loader(self.id)
+            self.loader = None
+        return self._description
+
+    @description.setter
+    def description(self, value):
+        self._description = value
+        self.loader = None
+
+    @property
+    def preview(self):
+        if self.loader is not None:
+            return self._description
+        description = self._description
+        return description[:DESCRIPTION_PREVIEW_CHARS] + ("..." if len(description) > DESCRIPTION_PREVIEW_CHARS else "")
+
+    @property
+    def status_name(self):
+        return STATUS_NAMES[self.status]
+
+    @property
+    def priority_name(self):
+        return PRIORITY_NAMES[self.priority]
+
+def iter_json_array(path, chunk_size=STREAM_CHUNK_BYTES):
+    # Incremental parse of a top level JSON array, yields (item, byte offset, byte length)
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    offset = 0
+    started = False
+    with open(path, "rb") as f:
+        more = True
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+                offset += 1
+            if pos == len(buffer):
+                if not more:
+                    raise ValueError("unterminated JSON array")
+                chunk = f.read(chunk_size)
+                more = bool(chunk)
+                buffer = utf8.decode(chunk, final=not more)
+                pos = 0
+                continue
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("expected a JSON array")
+                started = True
+                pos += 1
+                offset += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                if end == len(buffer) and more:
+                    raise ValueError("item cut at chunk boundary")
+            except ValueError:
+                if not more:
+                    raise
+                # The item continues in the next chunk
+                chunk = f.read(chunk_size)
+                more = bool(chunk)
+                buffer = buffer[pos:] + utf8.decode(chunk, final=not more)
+                pos = 0
+                continue
+            text = buffer[pos:end]
+            length = len(text) if text.isascii() else len(text.encode("utf-8"))
+            yield item, offset, length
+            offset += length
+            pos = end
+
+def read_json_item(path, offset, length, task_id):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        try:
+            item = json.loads(f.read(length))
+        except ValueError:
+            item = None
+    # None when the snapshot was rewritten since the offset was taken
+    return item if isinstance(item, dict) and item.get("id") == task_id else None
+
+def apply_journal_record(tasks_by_id, record):
+    op = record["op"]
+    if op == "create":
+        tasks_by_id[record["task"]["id"]] = record["task"]
+    elif op == "delete":
+        tasks_by_id.pop(record["id"], None)
+    elif record["id"] in tasks_by_id:
+        if op == "update":
+            tasks_by_id[record["id"]].update(record["fields"])
+        elif op == "move":
+            tasks_by_id[record["id"]].update(status=record["status"], updated_at=record["updated_at"])
+
+def merge_task_lists(on_disk, ours):
+    # By id, the newer updated_at wins, tasks only one side knows about are kept
+    merged = {task["id"]: task for task in ours}
+    for task in on_disk:
+        mine = merged.get(task["id"])
+        if mine is None or (parse_timestamp(task.get("updated_at")) or 0) > (parse_timestamp(mine.get("updated_at")) or 0):
+            merged[task["id"]] = task
+    return list(merged.values())
+
+class TaskStore:
+    # Storage interface, the app only talks to a store through these methods
+    def load(self):
+        raise NotImplementedError
+
+    def iter_batches(self, batch_size=LOAD_BATCH_SIZE):
+        # Entries are (seq, task, description), description is the full text
+        # when the task only holds its preview, None otherwise
+        yield 1.0, [(seq, task, None) for seq, task in enumerate(self.load())]
+
+    def count_by_status(self):
+        # Tasks per status name when the store can tell without reading every
+        # task, None otherwise. The board shows them while it streams in.
+        return None
+
+    def create(self, task):
+        raise NotImplementedError
+
+    def update(self, task_id, fields):
+        raise NotImplementedError
+
+    def delete(self, task_id):
+        raise NotImplementedError
+
+    def apply(self, changes):
+        # changes: list of (op, task_id, fields) as produced by PersistenceWorker
+        for op, task_id, fields in changes:
+            if op == "create":
+                self.create(fields)
+            elif op == "update":
+                self.update(task_id, fields)
+            else:
+                self.delete(task_id)
+
+    def write_snapshot(self, tasks):
+        raise NotImplementedError
+
+    def watched_paths(self):
+        # Files another process touches when it changes the board
+        return []
+
+    def read_changes(self):
+        # What other processes changed since the last call: ("records", journal
+        # records) or ("snapshot", every task) when only a full read can tell
+        return "records", []
+
+    def close(self):
+        pass
+
+class JournalStore(TaskStore):
+    # tasks.json is the snapshot, every mutation is appended to tasks.json.journal
+    # and the journal is folded back into the snapshot once it grows too large
+    def __init__(self, path, compact_bytes=JOURNAL_COMPACT_BYTES):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compacting_path = self.journal_path + ".old"
+        self.compact_bytes = compact_bytes
+        self.lock = FileLock(path + LOCK_SUFFIX)
+        self.compactor = None
+        # How far this process has read, read_changes picks up from there
+        self.snapshot_key = None
+        self.journal_inode = None
+        self.journal_offset = 0
+        # id -> (offset, length) in a snapshot rewritten after it was streamed
+        self.offsets_lock = threading.Lock()
+        self.offsets_key = None
+        self.offsets = {}
+
+    def load(self):
+        return [Task.from_dict(task) for task in self.load_records()]
+
+    def load_records(self):
+        with self.lock:
+            tasks_by_id = {task["id"]: task for task in self.read_snapshot()}
+            self.replay(self.compacting_path, tasks_by_id)
+            records, end = self.read_records(self.journal_path)
+            for record in records:
+                apply_journal_record(tasks_by_id, record)
+            self.mark_read(end)
+        return list(tasks_by_id.values())
+
+    def mark_read(self, journal_end):
+        key = file_key(self.journal_path)
+        self.snapshot_key = file_key(self.path)
+        self.journal_inode = key[0] if key else None
+        self.journal_offset = journal_end
+
+    def watched_paths(self):
+        return [self.path, self.journal_path]
+
+    def read_changes(self):
+        with self.lock:
+            key = file_key(self.journal_path)
+            inode = key[0] if key else None
+            replaced = self.journal_offset and (inode != self.journal_inode or key[2] < self.journal_offset)
+            if file_key(self.path) != self.snapshot_key or replaced:
+                # Compacted or saved in full elsewhere, the journal offsets mean nothing now
+                return "snapshot", self.load_records()
+            if key is None or key[2] == self.journal_offset:
+                return "records", []
+            records, end = self.read_records(self.journal_path, self.journal_offset)
+            self.journal_inode = inode
+            self.journal_offset = end
+            return "records", records
+
+    def read_snapshot(self):
+        if not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                tasks = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return tasks if isinstance(tasks, list) else []
+
+    def replay(self, journal_path, tasks_by_id):
+        for record in self.read_journal(journal_path):
+            apply_journal_record(tasks_by_id, record)
+
+    def read_journal(self, journal_path):
+        return self.read_records(journal_path)[0]
+
+    def read_records(self, journal_path, start=0):
+        # Complete records from start on, and the offset right after the last one
+        records = []
+        if not os.path.exists(journal_path):
+            return records, 0
+        good_size = start
+        torn = False
+        with open(journal_path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    torn = True
+                    break
+                good_size += len(line)
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Damaged but complete, the records after it are still good
+                    print(f"⚠️ Skipping a damaged record at byte {good_size - len(line)} of {journal_path}")
+        if torn:
+            # Only the last record can be torn, cut it so new records start clean.
+            # Writers hold the lock, so this is a crash and not a write in progress.
+            with open(journal_path, "r+b") as f:
+                f.truncate(good_size)
+        return records, good_size
+
+    @staticmethod
+    def cut_torn_tail(f, end):
+        # Called with the lock held on a journal not ending in a newline: the
+        # last line is what a crash left behind, cut it and return the new end
+        pos = end
+        while pos > 0:
+            step = min(pos, 65536)
+            f.seek(pos - step)
+            newline = f.read(step).rfind(b"\n")
+            if newline >= 0:
+                pos = pos - step + newline + 1
+                break
+            pos -= step
+        print(f"⚠️ Cut {end - pos} bytes of a torn record from {f.name}")
+        f.truncate(pos)
+        return pos
+
+    def load_description(self, offset, length, task_id):
+        item = read_json_item(self.path, offset, length, task_id)
+        if item is None:
+            # Compacted or saved since the board was streamed, the old offsets
+            # are looked up again in one pass over the new snapshot
+            place = self.item_offsets().get(task_id)
+            item = read_json_item(self.path, *place, task_id) if place else None
+        return (item or {}).get("description", "")
+
+    def item_offsets(self):
+        with self.offsets_lock:
+            key = file_key(self.path)
+            if key != self.offsets_key:
+                self.offsets = {}
+                try:
+                    for item, offset, length in iter_json_array(self.path) if key else ():
+                        self.offsets[item.get("id")] = (offset, length)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Error while reading {self.path}: {e}")
+                self.offsets_key = key
+            return self.offsets
+
+    def pending_records(self):
+        # Journal records not folded into the snapshot yet, grouped by task id.
+        # Tasks created or deleted there are deferred and placed the way load() would.
+        with self.lock:
+            records, end = self.read_records(self.journal_path)
+            records = self.read_journal(self.compacting_path) + records
+            self.mark_read(end)
+        updates = {}
+        deferred = set()
+        for record in records:
+            task_id = record["task"]["id"] if record["op"] == "create" else record["id"]
+            updates.setdefault(task_id, []).append(record)
+            if record["op"] != "update" and record["op"] != "move":
+                deferred.add(task_id)
+        return records, updates, deferred
+
+    @staticmethod
+    def held_entries(records, deferred, held, seq):
+        for record in records:
+            if (record["task"]["id"] if record["op"] == "create" else record["id"]) in deferred:
+                apply_journal_record(held, record)
+        return [(seq + index, Task.from_dict(item), None) for index, item in enumerate(held.values())]
+
+    @staticmethod
+    def column_batches(columns, batch_size, progress):
+        # The first page of every column, then the rest of each column
+        for start in range(0, max(map(len, columns.values()), default=0), batch_size):
+            for entries in columns.values():
+                if entries[start:start + batch_size]:
+                    yield progress, entries[start:start + batch_size]
+
+    def iter_batches(self, batch_size=LOAD_BATCH_SIZE):
+        # Streams the snapshot, yields (progress, [(seq, task, description), ...]) as it goes.
+        # Long descriptions are left on disk until a task is opened. Tasks are
+        # held by status until every column has a first batch (or enough of
+        # the file was read), so no column waits for a long run of another
+        # status at the top of the file.
+        records, updates, deferred = self.pending_records()
+        held = {}
+        columns = {}
+        batch = []
+        seq = 0
+        progress = 0.0
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        items = iter_json_array(self.path) if size else ()
+        try:
+            for item, offset, length in items:
+                task_id = item.get("id")
+                if task_id in deferred:
+                    held[task_id] = item
+                    continue
+                loader = functools.partial(self.load_description, offset, length)
+                for record in updates.get(task_id, ()):
+                    apply_journal_record({task_id: item}, record)
+                    # The snapshot only has the old text, keep the journaled one in memory
+                    if "description" in record.get("fields", ()):
+                        loader = None
+                task = Task.from_dict(item, loader)
+                entry = (seq, task, item.get("description", "") if task.loader else None)
+                seq += 1
+                progress = (offset + length) / size
+                if columns is not None:
+                    columns.setdefault(task.status, []).append(entry)
+                    if seq >= FIRST_BATCHES_SCAN or all(len(columns.get(status, ())) >= batch_size for status in range(len(STATUSES))):
+                        yield from self.column_batches(columns, batch_size, progress)
+                        columns = None
+                    continue
+                batch.append(entry)
+                if len(batch) >= batch_size:
+                    yield progress, batch
+                    batch = []
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Error while reading {self.path}: {e}")
+        if columns:
+            yield from self.column_batches(columns, batch_size, progress)
+        yield 1.0, batch + self.held_entries(records, deferred, held, seq)
+
+    def append(self, *records):
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        with self.lock:
+            with open(self.journal_path, "a+b") as f:
+                start = f.seek(0, os.SEEK_END)
+                if start:
+                    f.seek(start - 1)
+                    if f.read(1) != b"\n":
+                        # Written without reading first, a torn tail would swallow our first record
+                        start = self.cut_torn_tail(f, start)
+                f.write(data.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+                inode = os.fstat(f.fileno()).st_ino
+            # Our own records need no reading back, unless others wrote before them
+            if start == self.journal_offset and inode == (self.journal_inode or inode):
+                self.journal_inode = inode
+                self.journal_offset = size
+        if size >= self.compact_bytes:
+            self.compact_in_background()
+
+    def create(self, task):
+        self.append({"op": "create", "task": task})
+
+    def update(self, task_id, fields):
+        self.append({"op": "update", "id": task_id, "fields": fields})
+
+    def delete(self, task_id):
+        self.append({"op": "delete", "id": task_id})
+
+    def apply(self, changes):
+        # A whole batch costs one append and one fsync
+        records = []
+        for op, task_id, fields in changes:
+            if op == "create":
+                records.append({"op": "create", "task": fields})
+            elif op == "update":
+                records.append({"op": "update", "id": task_id, "fields": fields})
+            else:
+                records.append({"op": "delete", "id": task_id})
+        if records:
+            self.append(*records)
+
+    def close(self):
+        # A compaction in flight has to finish before the process exits
+        if self.compactor is not None:
+            self.compactor.join()
+
+    def write_snapshot(self, tasks):
+        with self.lock:
+            if not self.is_current():
+                # Someone else wrote since we last read, keep their newer tasks
+                tasks = merge_task_lists(self.load_records(), tasks)
+            self.write_file(tasks)
+            for journal_path in (self.compacting_path, self.journal_path):
+                if os.path.exists(journal_path):
+                    os.remove(journal_path)
+            self.mark_read(0)
+
+    def write_file(self, tasks):
+        write_json_atomic(self.path, tasks, indent=2)
+
+    def is_current(self):
+        # Nothing was written by other processes since this one last read
+        if file_key(self.path) != self.snapshot_key:
+            return False
+        key = file_key(self.journal_path)
+        if key is None:
+            return self.journal_offset == 0
+        return key[0] == self.journal_inode and key[2] == self.journal_offset
+
+    def compact_in_background(self):
+        if self.compactor is not None and self.compactor.is_alive():
+            return
+        self.compactor = threading.Thread(target=self.compact, daemon=True)
+        self.compactor.start()
+
+    def compact(self):
+        # Held under the lock throughout so other processes never see it half done
+        with self.lock:
+            if not os.path.exists(self.compacting_path):
+                if not os.path.exists(self.journal_path):
+                    return
+                caught_up = self.is_current()
+                os.replace(self.journal_path, self.compacting_path)
+            else:
+                caught_up = False
+
+            tasks_by_id = {task["id"]: task for task in self.read_snapshot()}
+            self.replay(self.compacting_path, tasks_by_id)
+            self.write_file(list(tasks_by_id.values()))
+            os.remove(self.compacting_path)
+            if caught_up:
+                self.mark_read(0)
+
+class SQLiteStore(TaskStore):
+    # One row per task keyed by its id, mutations are single-row transactions.
+    # Fields outside the usual ones are kept as a JSON object in extra.
+    COLUMNS = ("id", "title", "description", "priority", "status", "created_at", "updated_at")
+    INSERT = "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+    def __init__(self, path):
+        import sqlite3
+
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " id TEXT PRIMARY KEY,"
+                " position INTEGER NOT NULL,"
+                " title TEXT NOT NULL,"
+                " description TEXT NOT NULL DEFAULT '',"
+                " priority TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " created_at TEXT NOT NULL,"
+                " updated_at TEXT NOT NULL,"
+                " extra TEXT)"
+            )
+            # Databases from before the extra column
+            if "extra" not in {row["name"] for row in self.conn.execute("PRAGMA table_info(tasks)")}:
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN extra TEXT")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS tasks_position ON tasks (position)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, position)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS tasks_priority ON tasks (priority)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS tasks_updated_at ON tasks (updated_at)")
+            # Every write is logged by id so other processes read only what changed
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS task_changes ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " id TEXT NOT NULL,"
+                " op TEXT NOT NULL)"
+            )
+            for trigger, event, row in (("inserted", "INSERT", "NEW"), ("updated", "UPDATE", "NEW"), ("deleted", "DELETE", "OLD")):
+                op = "delete" if event == "DELETE" else "upsert"
+                self.conn.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS tasks_{trigger} AFTER {event} ON tasks"
+                    f" BEGIN INSERT INTO task_changes (id, op) VALUES ({row}.id, '{op}'); END"
+                )
+        self.change_seq = self.last_change()
+
+    def last_change(self):
+        return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM task_changes").fetchone()[0]
+
+    def write_transaction(self, write):
+        # Runs write in one transaction, our own log entries are skipped when
+        # nobody else wrote in between, old entries are pruned
+        with self.lock, self.conn:
+            before = self.last_change()
+            write()
+            last = self.last_change()
+            if before == self.change_seq:
+                self.change_seq = last
+            if last > CHANGE_LOG_KEEP * 2:
+                self.conn.execute("DELETE FROM task_changes WHERE seq <= ?", (last - CHANGE_LOG_KEEP,))
+
+    def watched_paths(self):
+        return [self.path, self.path + "-wal"]
+
+    def read_changes(self):
+        with self.lock:
+            first, last = self.conn.execute("SELECT MIN(seq), MAX(seq) FROM task_changes").fetchone()
+            if last is None or last <= self.change_seq:
+                return "records", []
+            if first > self.change_seq + 1:
+                # Pruned past what this process has seen
+                rows = self.conn.execute("SELECT * FROM tasks ORDER BY position").fetchall()
+                self.change_seq = last
+                return "snapshot", [self.row_to_data(row) for row in rows]
+            rows = self.conn.execute(
+                "SELECT c.seq, c.id AS changed_id, t.* FROM task_changes c LEFT JOIN tasks t ON t.id = c.id"
+                " WHERE c.seq > ? ORDER BY c.seq",
+                (self.change_seq,)
+            ).fetchall()
+            self.change_seq = last
+        # Rows hold the current state, one record per changed id is enough
+        latest = {row["changed_id"]: row for row in rows}
+        return "records", [
+            {"op": "create", "task": self.row_to_data(row)}
+            if row["id"] is not None else {"op": "delete", "id": task_id}
+            for task_id, row in latest.items()
+        ]
+
+    def row_to_data(self, row):
+        data = {column: row[column] for column in self.COLUMNS}
+        if row["extra"]:
+            data.update(json.loads(row["extra"]))
+        return data
+
+    def row_to_task(self, row):
+        return Task.from_dict(self.row_to_data(row))
+
+    def task_to_row(self, task, position):
+        # task is the JSON form of a task
+        extra = {name: value for name, value in task.items() if name not in self.COLUMNS}
+        return (
+            task["id"], position, task.get("title", ""), task.get("description", ""),
+            task.get("priority", PRIORITIES[0]), task.get("status", STATUSES[0]),
+            task.get("created_at", ""), task.get("updated_at", ""),
+            json.dumps(extra, ensure_ascii=False) if extra else None
+        )
+
+    def load(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM tasks ORDER BY position").fetchall()
+        return [self.row_to_task(row) for row in rows]
+
+    def load_description(self, task_id):
+        with self.lock:
+            row = self.conn.execute("SELECT description FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return row[0] if row else ""
+
+    def iter_batches(self, batch_size=LOAD_BATCH_SIZE):
+        # First page of every column comes first, then each column is paged in by position
+        with self.lock:
+            total = self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] or 1
+        query = "SELECT * FROM tasks WHERE status = ? AND position > ? ORDER BY position LIMIT ?"
+        cursors = {status: -1 for status in STATUSES}
+        loaded = 0
+        while cursors:
+            for status in list(cursors):
+                with self.lock:
+                    rows = self.conn.execute(query, (status, cursors[status], batch_size)).fetchall()
+                if len(rows) < batch_size:
+                    del cursors[status]
+                if not rows:
+                    continue
+                cursors[status] = rows[-1]["position"]
+                batch = [self.row_to_entry(row) for row in rows]
+                loaded += len(batch)
+                yield loaded / total, batch
+
+        # Tasks with a status the board does not show still have to be kept
+        placeholders = ", ".join("?" for _ in STATUSES)
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM tasks WHERE status NOT IN ({placeholders}) ORDER BY position", STATUSES
+            ).fetchall()
+        yield 1.0, [(row["position"], self.row_to_task(row), None) for row in rows]
+
+    def row_to_entry(self, row):
+        # The full description is read once for the search index, the task keeps the preview
+        task = Task.from_dict(self.row_to_data(row), self.load_description)
+        return row["position"], task, row["description"] if task.loader else None
+
+    def count_by_status(self):
+        counts = {status: 0 for status in STATUSES}
+        with self.lock:
+            for status, count in self.conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+                counts[status] = count
+        return counts
+
+    def create(self, task):
+        self.apply([("create", task["id"], task)])
+
+    def update(self, task_id, fields):
+        self.apply([("update", task_id, fields)])
+
+    def delete(self, task_id):
+        self.apply([("delete", task_id, None)])
+
+    def apply(self, changes):
+        # A whole batch is one transaction
+        def write():
+            position = self.conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM tasks").fetchone()[0]
+            for op, task_id, fields in changes:
+                if op == "create":
+                    self.conn.execute(
+                        self.INSERT,
+                        self.task_to_row(fields, position)
+                    )
+                    position += 1
+                elif op == "update":
+                    extra = {name: value for name, value in fields.items() if name not in self.COLUMNS}
+                    fields = {column: value for column, value in fields.items() if column in self.COLUMNS[1:]}
+                    if extra:
+                        row = self.conn.execute("SELECT extra FROM tasks WHERE id = ?", (task_id,)).fetchone()
+                        fields["extra"] = json.dumps({**json.loads(row[0] or "{}"), **extra}, ensure_ascii=False) if row else None
+                    if fields:
+                        assignments = ", ".join(f"{column} = ?" for column in fields)
+                        self.conn.execute(
+                            f"UPDATE tasks SET {assignments} WHERE id = ?",
+                            (*fields.values(), task_id)
+                        )
+                else:
+                    self.conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+        self.write_transaction(write)
+
+    def write_snapshot(self, tasks):
+        def write():
+            rows = tasks
+            if self.last_change() > self.change_seq:
+                # Someone else wrote since we last read, keep their newer tasks
+                on_disk = self.conn.execute("SELECT * FROM tasks ORDER BY position").fetchall()
+                rows = merge_task_lists([self.row_to_data(row) for row in on_disk], tasks)
+            self.conn.execute("DELETE FROM tasks")
+            self.conn.executemany(
+                self.INSERT,
+                (self.task_to_row(task, position) for position, task in enumerate(rows))
+            )
+
+        self.write_transaction(write)
+
+    def is_empty(self):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is None
+
+    def import_json(self, path):
+        # Existing tasks.json boards, including any pending journal records
+        tasks = JournalStore(path).load_records()
+        with self.lock, self.conn:
+            start = self.conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM tasks").fetchone()[0]
+            self.conn.executemany(
+                self.INSERT,
+                (self.task_to_row(task, position) for position, task in enumerate(tasks, start))
+            )
+        return len(tasks)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+# Binary snapshot: a fixed header, the status and priority names, one fixed
+# width record per task, a per-status index of record numbers and a string
+# table holding titles, descriptions and anything else that varies in length.
+# magic, tasks, names length, columns, records offset, index offset, strings offset
+BINARY_MAGIC = b"TPB\x01"
+BINARY_HEADER = struct.Struct("<4sIIIQQQ")
+# id, flags, status, priority, created_at, updated_at, then (offset, length)
+# in the string table for the title, the description and the extra fields
+BINARY_RECORD = struct.Struct("<16sHHHddQIQIQI")
+# Ids that are not a UUID in its usual text form are kept in the string table
+BINARY_TEXT_ID = struct.Struct("<QI4x")
+RECORD_TEXT_ID = 1
+UUID_TEXT = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+# Enough UTF-8 for one more character than the card preview shows
+PREVIEW_BYTES = (DESCRIPTION_PREVIEW_CHARS + 1) * 4
+
+def write_binary_snapshot(path, tasks):
+    # tasks are in their JSON form, the file replaces path in one rename
+    statuses, priorities = list(STATUSES), list(PRIORITIES)
+    status_codes = {name: code for code, name in enumerate(statuses)}
+    priority_codes = {name: code for code, name in enumerate(priorities)}
+    strings = bytearray()
+    records = bytearray()
+    columns = [[] for _ in statuses]
+    fields = set(TASK_FIELDS)
+
+    def string(text):
+        data = text.encode("utf-8")
+        strings.extend(data)
+        return len(strings) - len(data), len(data)
+
+    def stamp(value):
+        timestamp = parse_timestamp(value)
+        return float("nan") if timestamp is None else timestamp
+
+    for number, task in enumerate(tasks):
+        task_id = str(task["id"])
+        flags = 0
+        if UUID_TEXT.fullmatch(task_id):
+            key = bytes.fromhex(task_id.replace("-", ""))
+        else:
+            flags |= RECORD_TEXT_ID
+            key = BINARY_TEXT_ID.pack(*string(task_id))
+        status = name_code(status_codes, statuses, task.get("status", STATUSES[0]))
+        priority = name_code(priority_codes, priorities, task.get("priority", PRIORITIES[0]))
+        extra = None if task.keys() <= fields else {name: value for name, value in task.items() if name not in fields}
+        created, updated = stamp(task.get("created_at")), stamp(task.get("updated_at"))
+        if created != created or updated != updated:
+            # NaN is no timestamp, one that did not parse travels with the extras
+            extra = {**(extra or {}), **unparsed_timestamps(task)} or None
+        records += BINARY_RECORD.pack(
+            key, flags, status, priority, created, updated,
+            *string(task.get("title", "")), *string(task.get("description", "")),
+            *(string(json.dumps(extra, ensure_ascii=False)) if extra else (0, 0))
+        )
+        columns.extend([] for _ in range(status + 1 - len(columns)))
+        columns[status].append(number)
+
+    names = json.dumps({"statuses": statuses, "priorities": priorities}).encode("utf-8")
+    records_offset = BINARY_HEADER.size + len(names)
+    index_offset = records_offset + len(records)
+    index = struct.pack(f"<{len(columns)}I", *map(len, columns))
+    index += b"".join(struct.pack(f"<{len(column)}I", *column) for column in columns)
+    header = BINARY_HEADER.pack(
+        BINARY_MAGIC, len(records) // BINARY_RECORD.size, len(names), len(columns),
+        records_offset, index_offset, index_offset + len(index)
+    )
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for part in (header, names, records, index, strings):
+            f.write(part)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class BinarySnapshot:
+    # Read-only view over the bytes of a binary snapshot (usually an mmap),
+    # a record is only unpacked when it is asked for
+    def __init__(self, data):
+        magic, self.count, names_length, columns, self.records, self.index, self.strings = BINARY_HEADER.unpack_from(data)
+        if magic != BINARY_MAGIC:
+            raise ValueError("not a binary task snapshot")
+        if self.records + self.count * BINARY_RECORD.size > self.index or self.strings > len(data):
+            raise ValueError("truncated binary task snapshot")
+        self.data = data
+        self.numbers = None
+        names = json.loads(bytes(data[BINARY_HEADER.size:BINARY_HEADER.size + names_length]))
+        self.status_names = names["statuses"]
+        self.priority_names = names["priorities"]
+        # Codes in the file mapped to the codes of this process
+        self.status_map = [name_code(STATUS_CODES, STATUS_NAMES, name) for name in self.status_names]
+        self.priority_map = [name_code(PRIORITY_CODES, PRIORITY_NAMES, name) for name in self.priority_names]
+        self.counts = struct.unpack_from(f"<{columns}I", data, self.index)
+        self.starts = list(itertools.accumulate((4 * count for count in self.counts), initial=self.index + 4 * columns))
+
+    def column(self, code, start=0, stop=None):
+        # Record numbers of one status in board order
+        stop = self.counts[code] if stop is None else min(stop, self.counts[code])
+        if start >= stop:
+            return ()
+        return struct.unpack_from(f"<{stop - start}I", self.data, self.starts[code] + 4 * start)
+
+    def text(self, offset, length, errors="strict"):
+        start = self.strings + offset
+        return self.data[start:start + length].decode("utf-8", errors)
+
+    def unpack(self, number):
+        return BINARY_RECORD.unpack_from(self.data, self.records + number * BINARY_RECORD.size)
+
+    def record_id(self, key, flags):
+        if flags & RECORD_TEXT_ID:
+            return self.text(*BINARY_TEXT_ID.unpack(key))
+        text = key.hex()
+        return f"{text[:8]}-{text[8:12]}-{text[12:16]}-{text[16:20]}-{text[20:]}"
+
+    def task_id(self, number):
+        key, flags = struct.unpack_from("<16sH", self.data, self.records + number * BINARY_RECORD.size)
+        return self.record_id(key, flags)
+
+    def find(self, task_id):
+        # Record numbers by id, built on the first lookup in this snapshot
+        if self.numbers is None:
+            self.numbers = {self.task_id(number): number for number in range(self.count)}
+        return self.numbers.get(task_id)
+
+    def description(self, number):
+        return self.text(*self.unpack(number)[8:10])
+
+    def item(self, number):
+        # The JSON form, same as one entry of tasks.json
+        key, flags, status, priority, created, updated, *texts = self.unpack(number)
+        data = {
+            "id": self.record_id(key, flags),
+            "title": self.text(texts[0], texts[1]),
+            "description": self.text(texts[2], texts[3]),
+            "priority": self.priority_names[priority],
+            "status": self.status_names[status],
+            "created_at": format_timestamp(None if created != created else created),
+            "updated_at": format_timestamp(None if updated != updated else updated)
+        }
+        if texts[5]:
+            data.update(json.loads(self.text(texts[4], texts[5])))
+        return data
+
+    def task(self, number, load_description):
+        # Long descriptions are not decoded, the task keeps its preview and
+        # calls load_description(number, task_id) when it is opened
+        key, flags, status, priority, created, updated, *texts = self.unpack(number)
+        task = Task(
+            self.record_id(key, flags),
+            self.text(texts[0], texts[1]),
+            self.text(texts[2], min(texts[3], PREVIEW_BYTES), "ignore" if texts[3] > PREVIEW_BYTES else "strict"),
+            self.priority_map[priority],
+            self.status_map[status],
+            None if created != created else created,
+            None if updated != updated else updated,
+            json.loads(self.text(texts[4], texts[5])) if texts[5] else None
+        )
+        if len(task._description) > DESCRIPTION_PREVIEW_CHARS:
+            task._description = task.preview
+            task.loader = functools.partial(load_description, number)
+        return task
+
+class BinaryStore(JournalStore):
+    # Same journal as JournalStore, the snapshot is a binary file read through
+    # mmap. Column counts come from its index and only the records streamed in
+    # so far are decoded, descriptions only when a task is opened.
+    def __init__(self, path, compact_bytes=JOURNAL_COMPACT_BYTES):
+        super().__init__(path, compact_bytes)
+        self.mapping_lock = threading.Lock()
+        self.mapping_key = None
+        self.view = None
+
+    def snapshot(self):
+        # Mapped again whenever the file was replaced, readers still holding
+        # the previous view keep it alive until they are done with it
+        with self.mapping_lock:
+            key = file_key(self.path)
+            if key != self.mapping_key:
+                self.view = None
+                if key is not None and key[2]:
+                    with open(self.path, "rb") as f:
+                        self.view = BinarySnapshot(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                self.mapping_key = key
+            return self.view
+
+    def read_snapshot(self):
+        try:
+            view = self.snapshot()
+        except (OSError, ValueError, struct.error):
+            return []
+        return [view.item(number) for number in range(view.count)] if view else []
+
+    def write_file(self, tasks):
+        # A mapped file cannot be replaced on Windows, let go of it first
+        with self.mapping_lock:
+            self.view = self.mapping_key = None
+        write_binary_snapshot(self.path, tasks)
+
+    def has_pending(self):
+        return any(os.path.exists(path) and os.path.getsize(path) for path in (self.journal_path, self.compacting_path))
+
+    def load_description(self, number, task_id):
+        view = self.snapshot()
+        if view is None:
+            return ""
+        if number >= view.count or view.task_id(number) != task_id:
+            # The snapshot was rewritten since it was streamed, look the task up again
+            number = view.find(task_id)
+            if number is None:
+                return ""
+        return view.description(number)
+
+    def iter_batches(self, batch_size=LOAD_BATCH_SIZE):
+        # First page of every column comes first, then each column is paged in
+        # by position, like SQLiteStore. Seqs are record numbers.
+        records, updates, deferred = self.pending_records()
+        held = {}
+        try:
+            view = self.snapshot()
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ Error while reading {self.path}: {e}")
+            view = None
+        count = view.count if view else 0
+        cursors = {code: 0 for code in range(len(view.counts))} if view else {}
+        loaded = 0
+        while cursors:
+            for code in list(cursors):
+                numbers = view.column(code, cursors[code], cursors[code] + batch_size)
+                cursors[code] += len(numbers)
+                if cursors[code] >= view.counts[code]:
+                    del cursors[code]
+                batch = []
+                for number in numbers:
+                    task = view.task(number, self.load_description)
+                    if task.id in deferred:
+                        held[task.id] = view.item(number)
+                    elif task.id in updates:
+                        item = view.item(number)
+                        for record in updates[task.id]:
+                            apply_journal_record({task.id: item}, record)
+                        batch.append((number, Task.from_dict(item), None))
+                    else:
+                        batch.append((number, task, view.description(number) if task.loader else None))
+                loaded += len(numbers)
+                if batch:
+                    yield loaded / count, batch
+        yield 1.0, self.held_entries(records, deferred, held, count)
+
+    def count_by_status(self):
+        # Straight from the index while the journal is empty
+        view = self.snapshot()
+        if view is None or self.has_pending():
+            return None
+        counts = {status: 0 for status in STATUSES}
+        for name, count in zip(view.status_names, view.counts):
+            counts[name] = counts.get(name, 0) + count
+        return counts
+
+    def is_empty(self):
+        return not any(os.path.exists(path) for path in (self.path, self.journal_path, self.compacting_path))
+
+    def import_json(self, path):
+        # Existing tasks.json boards, including any pending journal records
+        tasks = JournalStore(path).load_records()
+        self.write_snapshot(tasks)
+        return len(tasks)
+
+def open_store(path=None, migrate=False):
+    # migrate: the window's first start on a new .db or .tpb board takes over
+    # the tasks.json next to it, scripts open exactly the file they name
+    path = path or DATA_FILE
+    if path.endswith(SQLITE_SUFFIXES + BINARY_SUFFIXES):
+        store = SQLiteStore(path) if path.endswith(SQLITE_SUFFIXES) else BinaryStore(path)
+        if migrate and store.is_empty() and os.path.exists(LEGACY_DATA_FILE):
+            store.import_json(LEGACY_DATA_FILE)
+        return store
+    return JournalStore(path)
+
+def merge_change(previous, op, fields):
+    # Fold a new change for one task into the one still waiting to be written
+    if previous is None:
+        return op, fields
+    previous_op, previous_fields = previous
+    if op == "delete":
+        return None if previous_op == "create" else ("delete", None)
+    if op == "create" or previous_op == "delete":
+        return "create", fields
+    return previous_op, {**previous_fields, **fields}
+
+class PersistenceWorker:
+    # Applies store mutations off the Tk thread, a burst of changes inside the
+    # debounce window is coalesced into a single write
+    def __init__(self, store, debounce=SAVE_DEBOUNCE_SECONDS):
+        self.store = store
+        self.debounce = debounce
+        self.pending = {}
+        self.snapshot = None
+        self.busy = False
+        self.flushing = False
+        self.closed = False
+        self.writes = 0
+        self.errors = 0
+        self.outbox = None
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def create(self, task):
+        self.submit(task.id, "create", task.to_dict())
+
+    def update(self, task, *fields):
+        data = task.to_dict() if "description" in fields else {
+            "title": task.title,
+            "priority": task.priority_name,
+            "status": task.status_name,
+            "updated_at": format_timestamp(task.updated_at)
+        }
+        self.submit(task.id, "update", {field: data[field] for field in fields})
+
+    def delete(self, task_id):
+        self.submit(task_id, "delete", None)
+
+    def submit(self, task_id, op, fields):
+        with self.condition:
+            change = merge_change(self.pending.pop(task_id, None), op, fields)
+            if change is not None:
+                self.pending[task_id] = change
+            self.condition.notify_all()
+
+    def save_snapshot(self, tasks):
+        # The snapshot already contains every pending change
+        snapshot = [task.to_dict() for task in tasks]
+        with self.condition:
+            self.snapshot = snapshot
+            self.pending = {}
+            self.condition.notify_all()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not (self.pending or self.snapshot is not None or self.closed):
+                    self.condition.wait()
+                # Let the rest of the burst arrive before writing
+                deadline = time.monotonic() + self.debounce
+                while not (self.flushing or self.closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if self.closed and not (self.pending or self.snapshot is not None):
+                    return
+                snapshot, self.snapshot = self.snapshot, None
+                changes = [(op, task_id, fields) for task_id, (op, fields) in self.pending.items()]
+                self.pending = {}
+                self.busy = True
+
+            try:
+                with METRICS.span("save_tasks"):
+                    if snapshot is not None:
+                        self.store.write_snapshot(snapshot)
+                    if changes:
+                        self.store.apply(changes)
+                        if self.outbox:
+                            append_outbox(self.outbox, changes)
+                self.writes += 1
+            except Exception as e:
+                print(f"⚠️ Error while saving tasks: {e}")
+                with self.condition:
+                    self.errors += 1
+                    # Keep unsaved changes, anything submitted since is newer
+                    for op, task_id, fields in changes:
+                        newer = self.pending.pop(task_id, None)
+                        change = (op, fields)
+                        if newer is not None:
+                            change = merge_change(change, *newer)
+                        if change is not None:
+                            self.pending[task_id] = change
+                    if self.snapshot is None:
+                        self.snapshot = snapshot
+                if self.closed:
+                    return
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def flush(self):
+        with self.condition:
+            errors = self.errors
+            self.flushing = True
+            self.condition.notify_all()
+            while (self.pending or self.snapshot is not None or self.busy) and self.thread.is_alive():
+                if self.errors != errors:
+                    break
+                self.condition.wait(0.1)
+            self.flushing = False
+
+    def close(self):
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+        self.store.close()
+
+    def has_pending(self, task_id):
+        # True while a local change to the task may not be on disk yet
+        with self.condition:
+            return task_id in self.pending or self.busy or self.snapshot is not None
+
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+
+def open_inotify(directory):
+    # inotify descriptor watching directory, None where inotify is not available
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+class ChangeWatcher:
+    # Calls on_change from its own thread when one of paths changes on disk,
+    # with inotify on Linux and by polling mtimes everywhere else
+    def __init__(self, paths, on_change, interval=WATCH_POLL_SECONDS):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.names = {os.fsencode(os.path.basename(path)) for path in self.paths}
+        self.on_change = on_change
+        self.interval = interval
+        self.mode = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        fd = open_inotify(os.path.dirname(self.paths[0])) if self.paths else None
+        if fd is None:
+            self.mode = "polling"
+            self.poll()
+            return
+        self.mode = "inotify"
+        try:
+            self.watch(fd)
+        finally:
+            os.close(fd)
+
+    def watch(self, fd):
+        while not self.stopped.is_set():
+            if not select.select([fd], [], [], self.interval)[0]:
+                continue
+            changed = self.read_events(fd)
+            # A burst of appends comes as many events, wait for it to settle
+            while select.select([fd], [], [], WATCH_SETTLE_SECONDS)[0]:
+                changed = self.read_events(fd) or changed
+            if changed:
+                self.on_change()
+
+    def read_events(self, fd):
+        data = os.read(fd, 64 * 1024)
+        offset = 0
+        changed = False
+        while offset + 16 <= len(data):
+            wd, mask, cookie, length = struct.unpack_from("iIII", data, offset)
+            name = data[offset + 16:offset + 16 + length].rstrip(b"\0")
+            changed = changed or name in self.names
+            offset += 16 + length
+        return changed
+
+    def poll(self):
+        stamps = [file_key(path) for path in self.paths]
+        while not self.stopped.wait(self.interval):
+            current = [file_key(path) for path in self.paths]
+            if current != stamps:
+                stamps = current
+                self.on_change()
+
+class TaskRepository:
+    # In-memory index of the board: tasks by id, one bucket per status kept in
+    # sequence order, running counts. Every mutation goes through here and is
+    # reported to the listeners (board, persistence) as a list of changes:
+    # (event, task, old_status, fields) with event in "add", "update", "delete".
+    # For an update fields maps each changed field to its previous value.
+    def __init__(self, next_seq=0):
+        self.by_id = {}
+        self.seq = {}
+        self.next_seq = next_seq
+        self.buckets = {}
+        self.listeners = []
+        self.pending = None
+        # Held while tasks change, so other threads (sync) read a task or the
+        # ids whole. Listeners run after it is released.
+        self.lock = threading.RLock()
+        # Where the current changes come from, None for the user; listeners can
+        # skip changes that are already persisted ("external")
+        self.origin = None
+
+    def bucket(self, status):
+        # (sequence numbers, tasks) for one status, both sorted by sequence
+        bucket = self.buckets.get(status)
+        if bucket is None:
+            bucket = self.buckets[status] = ([], [])
+        return bucket
+
+    def rows(self, status):
+        return self.bucket(status)[1]
+
+    def count(self, status):
+        return len(self.bucket(status)[1])
+
+    def get(self, task_id):
+        return self.by_id.get(task_id)
+
+    def tasks(self):
+        return sorted(self.by_id.values(), key=lambda task: self.seq[task.id])
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def insert_into_bucket(self, task):
+        seqs, rows = self.bucket(task.status)
+        seq = self.seq[task.id]
+        pos = bisect.bisect_left(seqs, seq)
+        seqs.insert(pos, seq)
+        rows.insert(pos, task)
+
+    def remove_from_bucket(self, task, status):
+        seqs, rows = self.bucket(status)
+        pos = bisect.bisect_left(seqs, self.seq[task.id])
+        del seqs[pos]
+        del rows[pos]
+
+    def notify(self, change):
+        if self.pending is not None:
+            self.pending.append(change)
+            return
+        for listener in self.listeners:
+            listener([change])
+
+    def add(self, task, seq=None):
+        # seq puts a task back at an old place, for undo
+        with self.lock:
+            self.by_id[task.id] = task
+            if seq is None:
+                seq = self.next_seq
+                self.next_seq += 1
+            self.seq[task.id] = seq
+            self.insert_into_bucket(task)
+        self.notify(("add", task, None, ()))
+
+    def add_many(self, entries):
+        # (task, seq) pairs put back at their old place, for undo
+        tasks = []
+        with self.lock:
+            for task, seq in entries:
+                if task.id not in self.by_id:
+                    self.by_id[task.id] = task
+                    self.seq[task.id] = seq
+                    tasks.append(task)
+            self.insert_into_buckets(tasks)
+        for task in tasks:
+            self.notify(("add", task, None, ()))
+
+    def update(self, task, **fields):
+        old_status = task.status
+        previous = {name: getattr(task, name) for name in fields}
+        with self.lock:
+            for name, value in fields.items():
+                setattr(task, name, value)
+            if task.status != old_status:
+                self.remove_from_bucket(task, old_status)
+                self.insert_into_bucket(task)
+        self.notify(("update", task, old_status, previous))
+
+    def delete(self, task):
+        # The sequence number is kept so listeners can still locate the task
+        with self.lock:
+            if self.by_id.pop(task.id, None) is None:
+                return
+            self.remove_from_bucket(task, task.status)
+        self.notify(("delete", task, task.status, ()))
+
+    def update_many(self, tasks, **fields):
+        # Bulk update: every bucket a task leaves or joins is rebuilt once
+        # instead of shifted once per task
+        changes = []
+        moved = []
+        with self.lock:
+            for task in tasks:
+                old_status = task.status
+                previous = {name: getattr(task, name) for name in fields}
+                for name, value in fields.items():
+                    setattr(task, name, value)
+                if task.status != old_status:
+                    moved.append((task, old_status))
+                changes.append(("update", task, old_status, previous))
+            self.remove_from_buckets(moved)
+            self.insert_into_buckets([task for task, old_status in moved])
+        for change in changes:
+            self.notify(change)
+
+    def delete_many(self, tasks):
+        with self.lock:
+            tasks = [task for task in tasks if self.by_id.pop(task.id, None) is not None]
+            self.remove_from_buckets([(task, task.status) for task in tasks])
+        for task in tasks:
+            self.notify(("delete", task, task.status, ()))
+
+    def remove_from_buckets(self, moved):
+        leaving = {}
+        for task, status in moved:
+            leaving.setdefault(status, set()).add(task.id)
+        for status, ids in leaving.items():
+            seqs, rows = self.bucket(status)
+            keep = [i for i, task in enumerate(rows) if task.id not in ids]
+            # In place, the board holds on to these lists
+            seqs[:] = [seqs[i] for i in keep]
+            rows[:] = [rows[i] for i in keep]
+
+    def insert_into_buckets(self, tasks):
+        joining = {}
+        for task in tasks:
+            joining.setdefault(task.status, []).append((self.seq[task.id], task))
+        for status, entries in joining.items():
+            seqs, rows = self.bucket(status)
+            # Two sorted runs, which sort merges in linear time
+            merged = sorted([*zip(seqs, rows), *sorted(entries, key=lambda entry: entry[0])], key=lambda entry: entry[0])
+            seqs[:] = [seq for seq, task in merged]
+            rows[:] = [task for seq, task in merged]
+
+    @contextlib.contextmanager
+    def batch(self):
+        # Listeners get every change made inside as a single list
+        if self.pending is not None:
+            yield
+            return
+        self.pending = []
+        try:
+            yield
+        finally:
+            changes, self.pending = self.pending, None
+            if changes:
+                for listener in self.listeners:
+                    listener(changes)
+
+    @staticmethod
+    def group_entries(entries, seen):
+        # Pure data work on a loaded batch, safe to run off the Tk thread
+        group = {"tasks": [], "seq": {}, "buckets": {}}
+        for seq, task, description in entries:
+            if task.id in seen:
+                continue
+            seen.add(task.id)
+            group["tasks"].append(task)
+            group["seq"][task.id] = seq
+            seqs, rows = group["buckets"].setdefault(task.status, ([], []))
+            seqs.append(seq)
+            rows.append(task)
+        return group
+
+    def merge(self, group):
+        # Loaded tasks are already persisted, listeners are not told about them
+        with self.lock:
+            for task in group["tasks"]:
+                self.by_id[task.id] = task
+        self.seq.update(group["seq"])
+        if group["seq"]:
+            self.next_seq = max(self.next_seq, max(group["seq"].values()) + 1)
+        for status, (new_seqs, new_rows) in group["buckets"].items():
+            seqs, rows = self.bucket(status)
+            if not seqs or seqs[-1] < new_seqs[0]:
+                seqs.extend(new_seqs)
+                rows.extend(new_rows)
+            else:
+                # A task was moved here while loading, merge around it
+                for seq, task in zip(new_seqs, new_rows):
+                    pos = bisect.bisect_left(seqs, seq)
+                    seqs.insert(pos, seq)
+                    rows.insert(pos, task)
+        return group["buckets"].keys()
+
+def persist_changes(writer, changes):
+    for event, task, old_status, fields in changes:
+        if event == "add":
+            writer.create(task)
+        elif event == "update":
+            writer.update(task, *fields)
+        else:
+            writer.delete(task.id)
+
+class History:
+    # Undo/redo log fed by the repository listeners. One listener call is one
+    # command, a list of deltas keyed by task id: the fields before and after
+    # an update, the task object and its sequence number for an add or a
+    # delete. Only changed values are kept, never a copy of the board.
+    def __init__(self, repo, limit=HISTORY_LIMIT, max_changes=HISTORY_MAX_CHANGES):
+        self.repo = repo
+        self.limit = limit
+        self.max_changes = max_changes
+        self.undo_stack = collections.deque()
+        self.redo_stack = []
+        self.size = 0
+
+    def record(self, changes):
+        # Only the user's own edits, not merges, archive pages or replays
+        if self.repo.origin is not None:
+            return
+        command = []
+        for event, task, old_status, fields in changes:
+            if event == "update":
+                command.append(("update", task.id, fields, {name: getattr(task, name) for name in fields}))
+            else:
+                if event == "delete" and task.loader is not None:
+                    # The store is about to forget the full description
+                    task.description
+                command.append((event, task, self.repo.seq[task.id]))
+        self.size -= sum(map(len, self.redo_stack))
+        self.redo_stack.clear()
+        self.undo_stack.append(command)
+        self.size += len(command)
+        while len(self.undo_stack) > self.limit or (self.size > self.max_changes and len(self.undo_stack) > 1):
+            self.size -= len(self.undo_stack.popleft())
+
+    def undo(self):
+        if not self.undo_stack:
+            return False
+        command = self.undo_stack.pop()
+        self.replay(reversed(command), True)
+        self.redo_stack.append(command)
+        return True
+
+    def redo(self):
+        if not self.redo_stack:
+            return False
+        command = self.redo_stack.pop()
+        self.replay(command, False)
+        self.undo_stack.append(command)
+        return True
+
+    def replay(self, entries, undo):
+        # Replayed changes are new edits for the disk, other windows and sync,
+        # so they carry the current time. Large runs of the same kind of delta
+        # go through the bulk repository calls, small ones cost O(change).
+        now = time.time()
+        run_kind, run_values, run = None, None, []
+
+        def flush():
+            values = {**(run_values or {}), "updated_at": now}
+            if len(run) > HISTORY_BULK_TASKS:
+                if run_kind == "update":
+                    self.repo.update_many(run, **values)
+                elif run_kind == "delete":
+                    self.repo.delete_many(run)
+                elif run_kind == "add":
+                    self.repo.add_many(run)
+                return
+            for item in run:
+                if run_kind == "update":
+                    self.repo.update(item, **values)
+                elif run_kind == "delete":
+                    self.repo.delete(item)
+                elif item[0].id not in self.repo.by_id:
+                    self.repo.add(*item)
+
+        self.repo.origin = "history"
+        try:
+            with self.repo.batch():
+                for entry in entries:
+                    if entry[0] == "update":
+                        task = self.repo.get(entry[1])
+                        if task is None:
+                            continue
+                        kind, values, item = "update", entry[2] if undo else entry[3], task
+                    elif (entry[0] == "add") == undo:
+                        task = self.repo.get(entry[1].id)
+                        if task is None:
+                            continue
+                        kind, values, item = "delete", None, task
+                    else:
+                        entry[1].updated_at = now
+                        kind, values, item = "add", None, (entry[1], entry[2])
+                    if kind != run_kind or values != run_values:
+                        flush()
+                        run_kind, run_values, run = kind, values, []
+                    run.append(item)
+                flush()
+        finally:
+            self.repo.origin = None
+
+SEARCH_TOKEN = re.compile(r"\w+")
+
+def search_terms(text):
+    # Distinct lowercase words in order, interned so postings share one string
+    return tuple(dict.fromkeys(sys.intern(token) for token in SEARCH_TOKEN.findall(text.lower())))
+
+def query_terms(text):
+    # What the search box filters on, shorter words than SEARCH_MIN_TERM are left out
+    return tuple(term for term in search_terms(text) if len(term) >= SEARCH_MIN_TERM)
+
+class SearchIndex:
+    # Inverted index over titles and descriptions: token -> task ids. A sorted
+    # copy of the vocabulary answers prefix queries with bisect, it is rebuilt
+    # lazily after bulk loads and kept in place for single edits.
+    def __init__(self):
+        self.postings = {}
+        self.tokens = {}
+        self.vocabulary = []
+        self.vocabulary_sorted = True
+
+    @staticmethod
+    def tokenize_entries(entries, group):
+        # Runs on the loading thread, where the full descriptions are still in hand.
+        # Duplicate ids dropped by group_entries are skipped the same way.
+        tokens = []
+        for seq, task, description in entries:
+            if group["seq"].get(task.id) == seq:
+                text = task.description if description is None else description
+                tokens.append((task.id, search_terms(task.title), search_terms(text)))
+        return tokens
+
+    def merge(self, tokens):
+        self.vocabulary_sorted = False
+        for task_id, title_tokens, description_tokens in tokens:
+            self.tokens[task_id] = (title_tokens, description_tokens)
+            self.index(task_id, set(title_tokens).union(description_tokens))
+
+    def index(self, task_id, tokens):
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                if self.vocabulary_sorted:
+                    bisect.insort(self.vocabulary, token)
+            ids.add(task_id)
+
+    def unindex(self, task_id, tokens):
+        for token in tokens:
+            ids = self.postings[token]
+            ids.discard(task_id)
+            if not ids:
+                del self.postings[token]
+                if self.vocabulary_sorted:
+                    del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+
+    def add(self, task):
+        self.merge_one(task.id, search_terms(task.title), search_terms(task.description))
+
+    def merge_one(self, task_id, title_tokens, description_tokens):
+        old = set().union(*self.tokens.get(task_id, ()))
+        new = set(title_tokens).union(description_tokens)
+        self.tokens[task_id] = (title_tokens, description_tokens)
+        self.unindex(task_id, old - new)
+        self.index(task_id, new - old)
+
+    def remove(self, task_id):
+        self.unindex(task_id, set().union(*self.tokens.pop(task_id, ())))
+
+    def apply_changes(self, changes):
+        # Repository listener, only the edited fields are tokenized again
+        for event, task, old_status, fields in changes:
+            if event == "add":
+                self.add(task)
+            elif event == "delete":
+                self.remove(task.id)
+            elif "title" in fields or "description" in fields:
+                title_tokens, description_tokens = self.tokens.get(task.id, ((), ()))
+                if "title" in fields:
+                    title_tokens = search_terms(task.title)
+                if "description" in fields:
+                    description_tokens = search_terms(task.description)
+                self.merge_one(task.id, title_tokens, description_tokens)
+
+    def prefixed(self, term):
+        if not self.vocabulary_sorted:
+            self.vocabulary = sorted(self.postings)
+            self.vocabulary_sorted = True
+        vocabulary = self.vocabulary
+        pos = bisect.bisect_left(vocabulary, term)
+        while pos < len(vocabulary) and vocabulary[pos].startswith(term):
+            yield vocabulary[pos]
+            pos += 1
+
+    def search(self, terms):
+        # Ids of the tasks where every term starts some word, longest terms
+        # first since they narrow the result the most
+        result = None
+        for term in sorted(terms, key=len, reverse=True):
+            ids = set()
+            for token in self.prefixed(term):
+                postings = self.postings[token]
+                ids.update(postings if result is None else result.intersection(postings))
+            result = ids
+            if not result:
+                break
+        return result if result is not None else set()
+
+    def matches(self, task_id, terms):
+        tokens = self.tokens.get(task_id, ((), ()))
+        return all(
+            any(token.startswith(term) for part in tokens for token in part)
+            for term in terms
+        )
+
+# Column sort modes: the precomputed part of a row's key, the sequence number
+# breaks ties so every key in a column is unique. Manual is the board order.
+SORT_MODES = {
+    "Manual": None,
+    "Priority": lambda task: -task.priority,
+    "Newest": lambda task: -(task.created_at or 0.0),
+    "Oldest": lambda task: task.created_at or 0.0,
+    "Recently updated": lambda task: -(task.updated_at or 0.0),
+    "Title": lambda task: task.title.casefold()
+}
+# Age filters on updated_at, (min days, max days)
+AGE_FILTERS = {
+    "Any age": None,
+    "Updated today": (0, 1),
+    "Last 7 days": (0, 7),
+    "Last 30 days": (0, 30),
+    "Older than 30 days": (30, None)
+}
+
+class ColumnView:
+    # The rows of one column in display order when it is sorted or filtered.
+    # Each row's key is computed once and kept by id, so an edit moves only
+    # its own row: out by bisect on the old key, back in on the new one.
+    # In board order the key is the sequence number, seq_of is shared with
+    # the repository. rows is shared with the column's task list.
+    def __init__(self, seq_of, sort="Manual", priorities=None, age=None, matches=None, now=None):
+        self.seq_of = seq_of
+        self.sort_key = SORT_MODES[sort]
+        self.priorities = priorities
+        self.window = None
+        if age is not None:
+            now = time.time() if now is None else now
+            low, high = age
+            self.window = (now - high * 86400 if high is not None else float("-inf"), now - low * 86400)
+        self.matches = matches
+        self.filtering = priorities is not None or age is not None or matches is not None
+        self.keys = []
+        self.rows = []
+        self.key_of = seq_of if self.sort_key is None else {}
+
+    def accepts(self, task, searched=False):
+        if self.priorities is not None and task.priority not in self.priorities:
+            return False
+        if self.window is not None and not self.window[0] <= (task.updated_at or 0.0) <= self.window[1]:
+            return False
+        return searched or self.matches is None or self.matches(task.id)
+
+    def key(self, task, seq):
+        return seq if self.sort_key is None else (self.sort_key(task), seq)
+
+    def build(self, seqs, rows, mask=None):
+        # seqs and rows in sequence order, mask marks the rows matching the search
+        if mask is not None:
+            seqs = list(itertools.compress(seqs, mask))
+            rows = list(itertools.compress(rows, mask))
+        if self.priorities is not None or self.window is not None:
+            keep = [self.accepts(task, True) for task in rows]
+            seqs = list(itertools.compress(seqs, keep))
+            rows = list(itertools.compress(rows, keep))
+        if self.sort_key is None:
+            self.keys = list(seqs)
+            self.rows = list(rows)
+            return
+        keys = [(self.sort_key(task), seq) for seq, task in zip(seqs, rows)]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[i] for i in order]
+        self.rows = [rows[i] for i in order]
+        self.key_of = {task.id: key for task, key in zip(self.rows, self.keys)}
+
+    def position(self, task_id):
+        key = self.key_of.get(task_id)
+        if key is None:
+            return None
+        pos = bisect.bisect_left(self.keys, key)
+        return pos if pos < len(self.rows) and self.rows[pos].id == task_id else None
+
+    def discard(self, task_id):
+        pos = self.position(task_id)
+        if pos is not None:
+            del self.keys[pos]
+            del self.rows[pos]
+
+    def place(self, task, seq):
+        self.discard(task.id)
+        if self.accepts(task):
+            key = self.key(task, seq)
+            if self.sort_key is not None:
+                self.key_of[task.id] = key
+            pos = bisect.bisect_left(self.keys, key)
+            self.keys.insert(pos, key)
+            self.rows.insert(pos, task)
+
+# Done tasks past the archive age leave the board for gzip JSONL segments that
+# are written once and never rewritten. index.json lists the segments with
+# their size and time range, plus the ids restored or deleted since; each
+# segment has a sorted vocabulary next to it so a search only opens the
+# segments that can match.
+class TaskArchive:
+    def __init__(self, path):
+        self.directory = path + ARCHIVE_SUFFIX
+        self.index_path = os.path.join(self.directory, "index.json")
+        self.lock = FileLock(self.directory + LOCK_SUFFIX)
+        self.index_key = None
+        self.index = {"segments": [], "dropped": []}
+        self.dropped = set()
+        self.vocabularies = {}
+
+    def read_index(self):
+        key = file_key(self.index_path)
+        if key != self.index_key:
+            index = read_json_file(self.index_path, None)
+            if isinstance(index, dict):
+                self.index = index
+                self.dropped = set(index.get("dropped", ()))
+            self.index_key = key
+        return self.index
+
+    def segments(self):
+        # Most recently updated first, the order "load older" pages them in
+        return sorted(self.read_index()["segments"], key=lambda segment: segment["newest"], reverse=True)
+
+    def count(self):
+        return sum(segment["count"] for segment in self.read_index()["segments"])
+
+    def add(self, tasks):
+        if not tasks:
+            return
+        import gzip
+
+        os.makedirs(self.directory, exist_ok=True)
+        with self.lock:
+            index = self.read_index()
+            for start in range(0, len(tasks), ARCHIVE_SEGMENT_TASKS):
+                chunk = tasks[start:start + ARCHIVE_SEGMENT_TASKS]
+                name = f"{len(index['segments']) + 1:06d}.jsonl.gz"
+                path = os.path.join(self.directory, name)
+                lines = "".join(json.dumps(data, ensure_ascii=False) + "\n" for data in chunk)
+                with open(path + ".tmp", "wb") as f:
+                    f.write(gzip.compress(lines.encode("utf-8")))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(path + ".tmp", path)
+                vocabulary = set()
+                for data in chunk:
+                    vocabulary.update(search_terms(f"{data.get('title', '')} {data.get('description', '')}"))
+                write_json_atomic(path + ".tokens", sorted(vocabulary))
+                stamps = [parse_timestamp(data.get("updated_at")) or 0.0 for data in chunk]
+                index["segments"].append({"name": name, "count": len(chunk), "oldest": min(stamps), "newest": max(stamps)})
+            write_json_atomic(self.index_path, index)
+            self.index_key = file_key(self.index_path)
+
+    def drop(self, task_ids):
+        # Archived tasks restored to the board or deleted, their copies stay in
+        # the segments but are not handed out again
+        with self.lock:
+            index = self.read_index()
+            new = set(task_ids) - self.dropped
+            if not new:
+                return
+            self.dropped.update(new)
+            index["dropped"] = sorted(self.dropped)
+            write_json_atomic(self.index_path, index)
+            self.index_key = file_key(self.index_path)
+
+    def read(self, segment):
+        import gzip
+
+        with open(os.path.join(self.directory, segment["name"]), "rb") as f:
+            lines = gzip.decompress(f.read()).decode("utf-8").splitlines()
+        # Drops made since the index was last read, here or in another process
+        self.read_index()
+        return [data for data in map(json.loads, lines) if data["id"] not in self.dropped]
+
+    def vocabulary(self, segment):
+        # Segments never change, neither do their vocabularies
+        vocabulary = self.vocabularies.get(segment["name"])
+        if vocabulary is None:
+            path = os.path.join(self.directory, segment["name"] + ".tokens")
+            vocabulary = self.vocabularies[segment["name"]] = read_json_file(path, [])
+        return vocabulary
+
+    def search(self, terms, limit=ARCHIVE_SEARCH_LIMIT):
+        found = []
+        for segment in self.segments():
+            vocabulary = self.vocabulary(segment)
+            if not all(self.has_prefix(vocabulary, term) for term in terms):
+                continue
+            for data in self.read(segment):
+                tokens = search_terms(f"{data.get('title', '')} {data.get('description', '')}")
+                if all(any(token.startswith(term) for token in tokens) for term in terms):
+                    found.append(data)
+                    if len(found) >= limit:
+                        return found
+        return found
+
+    @staticmethod
+    def has_prefix(vocabulary, term):
+        pos = bisect.bisect_left(vocabulary, term)
+        return pos < len(vocabulary) and vocabulary[pos].startswith(term)
+
+def archivable(task, cutoff):
+    return task.status == ARCHIVE_STATUS and task.updated_at is not None and task.updated_at < cutoff
+
+def archive_tasks(store, tasks):
+    # Into the archive first: a crash in between leaves a task in both places, never in neither
+    TaskArchive(store.path).add(tasks)
+    store.apply([("delete", data["id"], None) for data in tasks])
+    return len(tasks)
+
+# Delta sync with a task server: each replica pushes the tasks it changed since
+# its last sync and pulls what changed on the server after its cursor, so the
+# traffic follows the number of edits and not the size of the board. Deleted
+# tasks travel as tombstones (task is None). A change is
+#   {"id": ..., "task": dict or None, "updated_at": epoch seconds}
+def canonical_task(task):
+    return json.dumps(task, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+def change_version(updated_at, canonical):
+    # Same total order on every replica and on the server: the newest
+    # updated_at wins, a tie goes to the larger canonical JSON
+    return updated_at, canonical
+
+def append_outbox(path, changes):
+    # Store changes waiting for the next sync, deletions keep their time for the tombstone
+    now = time.time()
+    lines = "".join(
+        json.dumps({"id": task_id if op != "create" else fields["id"], "deleted_at": now if op == "delete" else None}) + "\n"
+        for op, task_id, fields in changes
+    )
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
+    except OSError as e:
+        print(f"⚠️ Error while recording changes for sync: {e}")
+
+def sync_outbox(data_path):
+    # Outbox of a board that has been synced before, None otherwise
+    if os.path.exists(data_path + SYNC_STATE_SUFFIX):
+        return data_path + OUTBOX_SUFFIX
+    return None
+
+class SyncClient:
+    # Runs on its own thread. Remote changes are written through a store of its
+    # own, the app's change watcher then merges them like any other process.
+    # lookup(task_id) returns the local task as a dict, or None.
+    def __init__(self, path, server, lookup, all_ids):
+        self.path = path
+        self.server = server.rstrip("/")
+        self.lookup = lookup
+        self.all_ids = all_ids
+        self.state_path = path + SYNC_STATE_SUFFIX
+        self.outbox_path = path + OUTBOX_SUFFIX
+        self.sending_path = self.outbox_path + ".sending"
+        state = read_json_file(self.state_path, {})
+        self.state = state if isinstance(state, dict) else {}
+        if "replica" not in self.state:
+            import uuid
+
+            self.state["replica"] = str(uuid.uuid4())
+        self.state.setdefault("cursor", 0)
+        self.state.setdefault("seeded", False)
+        if not os.path.exists(self.state_path):
+            write_json_atomic(self.state_path, self.state)
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.last_error = None
+
+    def start(self, interval=SYNC_INTERVAL_SECONDS):
+        def run():
+            while True:
+                self.sync_quietly()
+                if self.stopped.wait(interval):
+                    return
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def sync_quietly(self):
+        try:
+            with METRICS.span("sync"):
+                self.sync()
+            self.last_error = None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Offline or a bad answer, the outbox is kept for the next round
+            self.last_error = str(e)
+            print(f"⚠️ Sync failed: {e}")
+
+    def sync(self):
+        # Returns (pushed, applied)
+        with self.lock:
+            pending = self.take_outbox()
+            if not self.state["seeded"]:
+                # First sync of this replica, the whole board goes up once
+                for task_id in self.all_ids():
+                    pending.setdefault(task_id, None)
+            deleted = {task_id: deleted_at for task_id, deleted_at in pending.items() if deleted_at is not None}
+            pushes = [self.local_change(task_id, deleted_at) for task_id, deleted_at in pending.items()]
+            pushed = applied = 0
+            store = open_store(self.path)
+            try:
+                while True:
+                    batch, pushes = pushes[:SYNC_BATCH_SIZE], pushes[SYNC_BATCH_SIZE:]
+                    response = self.post({
+                        "replica": self.state["replica"],
+                        "cursor": self.state["cursor"],
+                        "limit": SYNC_BATCH_SIZE,
+                        "changes": batch
+                    })
+                    pushed += len(batch)
+                    applied += self.apply_remote(store, response["changes"], deleted)
+                    self.state["cursor"] = response["cursor"]
+                    write_json_atomic(self.state_path, self.state)
+                    if not pushes and not response["more"]:
+                        break
+            finally:
+                store.close()
+            self.state["seeded"] = True
+            write_json_atomic(self.state_path, self.state)
+            if os.path.exists(self.sending_path):
+                os.remove(self.sending_path)
+            return pushed, applied
+
+    def take_outbox(self):
+        # The outbox is moved aside before reading, changes saved meanwhile start
+        # a new one. A failed sync leaves .sending behind for the next round.
+        if os.path.exists(self.outbox_path):
+            taking = self.outbox_path + ".taking"
+            os.replace(self.outbox_path, taking)
+            with open(taking, "rb") as src, open(self.sending_path, "ab") as dst:
+                dst.write(src.read())
+            os.remove(taking)
+        pending = {}
+        if os.path.exists(self.sending_path):
+            with open(self.sending_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    # Dict order follows the last change of each task
+                    pending.pop(entry["id"], None)
+                    pending[entry["id"]] = entry["deleted_at"]
+        return pending
+
+    def local_change(self, task_id, deleted_at):
+        task = self.lookup(task_id)
+        if task is None:
+            return {"id": task_id, "task": None, "updated_at": deleted_at or time.time()}
+        return {"id": task_id, "task": task, "updated_at": parse_timestamp(task.get("updated_at")) or 0.0}
+
+    def apply_remote(self, store, changes, deleted):
+        store_changes = []
+        for change in changes:
+            task_id = change["id"]
+            local = self.lookup(task_id)
+            if local is not None:
+                mine = change_version(parse_timestamp(local.get("updated_at")) or 0.0, canonical_task(local))
+            elif task_id in deleted:
+                mine = change_version(deleted[task_id], canonical_task(None))
+            else:
+                mine = None
+            if mine is not None and mine >= change_version(change["updated_at"], canonical_task(change["task"])):
+                continue
+            if change["task"] is None:
+                if local is not None:
+                    store_changes.append(("delete", task_id, None))
+            elif local is not None:
+                store_changes.append(("update", task_id, {name: value for name, value in change["task"].items() if name != "id"}))
+            else:
+                store_changes.append(("create", None, change["task"]))
+        if store_changes:
+            store.apply(store_changes)
+        return len(store_changes)
+
+    def post(self, payload):
+        import gzip
+        import urllib.request
+
+        body = gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        request = urllib.request.Request(self.server + "/sync", data=body, headers={
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+            "Accept-Encoding": "gzip"
+        })
+        with urllib.request.urlopen(request, timeout=SYNC_TIMEOUT_SECONDS) as response:
+            data = response.read()
+            encoding = response.headers.get("Content-Encoding")
+        self.bytes_sent += len(body)
+        self.bytes_received += len(data)
+        if encoding == "gzip":
+            data = gzip.decompress(data)
+        return json.loads(data)
+
+class SyncServer:
+    # Reference server state: one row per task id with its winning version,
+    # seq grows with every accepted change so a replica pulls the rows after its cursor
+    def __init__(self, path):
+        import sqlite3
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS changes (id TEXT PRIMARY KEY, seq INTEGER NOT NULL, "
+                "updated_at REAL NOT NULL, task TEXT NOT NULL, replica TEXT NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS changes_seq ON changes(seq)")
+        self.seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def handle(self, request):
+        replica = str(request["replica"])
+        cursor = int(request["cursor"])
+        limit = max(1, min(int(request.get("limit", SYNC_BATCH_SIZE)), SYNC_BATCH_SIZE))
+        with self.lock, self.conn:
+            for change in request["changes"]:
+                canonical = canonical_task(change["task"])
+                row = self.conn.execute("SELECT updated_at, task FROM changes WHERE id = ?", (change["id"],)).fetchone()
+                if row is not None and change_version(*row) >= change_version(change["updated_at"], canonical):
+                    continue
+                self.seq += 1
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO changes (id, seq, updated_at, task, replica) VALUES (?, ?, ?, ?, ?)",
+                    (change["id"], self.seq, float(change["updated_at"]), canonical, replica)
+                )
+            rows = self.conn.execute(
+                "SELECT id, seq, updated_at, task, replica FROM changes WHERE seq > ? ORDER BY seq LIMIT ?",
+                (cursor, limit)
+            ).fetchall()
+        # A replica's own changes are skipped, the cursor still moves past them
+        return {
+            "cursor": rows[-1][1] if rows else cursor,
+            "more": len(rows) == limit,
+            "changes": [
+                {"id": task_id, "task": json.loads(task), "updated_at": updated_at}
+                for task_id, seq, updated_at, task, origin in rows
+                if origin != replica
+            ]
+        }
+
+    def close(self):
+        self.conn.close()
+
+def make_sync_server(path, host="127.0.0.1", port=SYNC_PORT):
+    import gzip
+    import http.server
+
+    state = SyncServer(path)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/sync":
+                self.send_error(404)
+                return
+            try:
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                response = state.handle(json.loads(body))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                self.send_error(400, str(e))
+                return
+            data = json.dumps(response, separators=(",", ":")).encode("utf-8")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                data = gzip.compress(data)
+                self.send_response(200)
+                self.send_header("Content-Encoding", "gzip")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer((host, port), Handler)
+    server.state = state
+    return server
+
+# Headless mode: python "Todo Python.py" <command> ... works on the board file
+# directly, without a display, and every command persists in one write
+CLI_FORMATS = ("jsonl", "csv", "json")
+
+def open_text(path, mode):
+    if path == "-":
+        stream = sys.stdin if mode == "r" else sys.stdout
+        return open(stream.fileno(), mode, encoding="utf-8", newline="", closefd=False)
+    return open(path, mode, encoding="utf-8", newline="")
+
+def file_format(path, fmt=None):
+    if fmt:
+        return fmt
+    extension = os.path.splitext(path.lower())[1]
+    return {".csv": "csv", ".json": "json"}.get(extension, "jsonl")
+
+def read_task_rows(path, fmt):
+    import csv
+
+    with open_text(path, "r") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        elif fmt == "json":
+            # Same array of tasks as tasks.json
+            tasks = json.load(f)
+            if not isinstance(tasks, list):
+                raise ValueError("expected a JSON array of tasks")
+            yield from tasks
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def write_task_rows(path, fmt, rows):
+    import csv
+
+    count = 0
+    with open_text(path, "w") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=TASK_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        elif fmt == "json":
+            rows = list(rows)
+            json.dump(rows, f, indent=2)
+            f.write("\n")
+            count = len(rows)
+        else:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += 1
+    return count
+
+def import_row(row, now):
+    # Rows are stored as given, missing ids and timestamps are filled in
+    row = {key: value for key, value in row.items() if key is not None and value not in (None, "")}
+    if "id" not in row:
+        import uuid
+
+        row["id"] = str(uuid.uuid4())
+    row.setdefault("title", "")
+    row.setdefault("description", "")
+    row.setdefault("priority", PRIORITIES[0])
+    row.setdefault("status", STATUSES[0])
+    # The board has a color per priority and a column per status, nothing else shows
+    if row["priority"] not in PRIORITIES:
+        raise ValueError(f"unknown priority {row['priority']!r}, expected one of {', '.join(PRIORITIES)}")
+    if row["status"] not in STATUSES:
+        raise ValueError(f"unknown status {row['status']!r}, expected one of {', '.join(STATUSES)}")
+    row.setdefault("created_at", now)
+    row.setdefault("updated_at", row["created_at"])
+    return row
+
+def task_filter(status=None, priority=None, older_than=None, now=None):
+    # older_than is in days and compares the last update
+    cutoff = None if older_than is None else (now or time.time()) - older_than * 86400
+
+    def matches(task):
+        if status is not None and task.status_name != status:
+            return False
+        if priority is not None and task.priority_name != priority:
+            return False
+        if cutoff is not None:
+            timestamp = task.updated_at if task.updated_at is not None else task.created_at
+            if timestamp is None or timestamp >= cutoff:
+                return False
+        return True
+
+    return matches
+
+def cli_apply(store, changes):
+    store.apply(changes)
+    outbox = sync_outbox(store.path)
+    if outbox and changes:
+        append_outbox(outbox, changes)
+    return len(changes)
+
+def cli_import(store, path, fmt):
+    # Rows that do not fit the board are reported and left out, returns (imported, rejected)
+    now = format_timestamp(time.time())
+    changes = []
+    rejected = 0
+    for number, row in enumerate(read_task_rows(path, fmt), 1):
+        try:
+            changes.append(("create", None, import_row(row, now)))
+        except ValueError as e:
+            print(f"⚠️ Row {number} skipped: {e}", file=sys.stderr)
+            rejected += 1
+    return cli_apply(store, changes), rejected
+
+def cli_export(store, path, fmt, matches):
+    return write_task_rows(path, fmt, (task.to_dict() for task in store.load() if matches(task)))
+
+def cli_move(store, matches, status):
+    fields = {"status": status, "updated_at": format_timestamp(time.time())}
+    changes = [
+        ("update", task.id, dict(fields))
+        for task in store.load()
+        if matches(task) and task.status_name != status
+    ]
+    return cli_apply(store, changes)
+
+def cli_delete(store, matches):
+    return cli_apply(store, [("delete", task.id, None) for task in store.load() if matches(task)])
+
+def cli_archive(store, days):
+    cutoff = time.time() - days * 86400
+    return archive_tasks(store, [task.to_dict() for task in store.load() if archivable(task, cutoff)])
+
+def cli_sync(store, server):
+    tasks = {task.id: task.to_dict() for task in store.load()}
+    client = SyncClient(store.path, server, tasks.get, lambda: list(tasks))
+    return client.sync()
+
+def cli_serve(path, host, port):
+    server = make_sync_server(path, host, port)
+    print(f"🔄 Sync server on http://{host}:{server.server_address[1]}, tasks in {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.state.close()
+    return 0
+
+def cli_main(argv):
+    import argparse
+    import csv
+
+    parser = argparse.ArgumentParser(prog="Todo Python.py", description="Headless board maintenance, no window is opened.")
+    parser.add_argument("--data", default=DATA_FILE, help="board file, tasks.json, a .tpb binary snapshot or a SQLite database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_filters(command):
+        command.add_argument("--status", choices=STATUSES)
+        command.add_argument("--priority", choices=PRIORITIES)
+        command.add_argument("--older-than", type=float, metavar="DAYS", help="last updated more than DAYS ago")
+
+    command = commands.add_parser("import", help="add tasks from a JSONL, CSV or tasks.json file, - reads stdin")
+    command.add_argument("file")
+    command.add_argument("--format", choices=CLI_FORMATS)
+    command = commands.add_parser("export", help="write tasks to a JSONL, CSV or tasks.json file, - writes stdout")
+    command.add_argument("file")
+    command.add_argument("--format", choices=CLI_FORMATS)
+    add_filters(command)
+    command = commands.add_parser("move", help="move every matching task to another column")
+    command.add_argument("--to", required=True, choices=STATUSES)
+    add_filters(command)
+    command = commands.add_parser("delete", help="delete every matching task")
+    add_filters(command)
+    command.add_argument("--all", action="store_true", help="delete without any filter")
+    command = commands.add_parser("archive", help="move Done tasks out of the board into the archive")
+    command.add_argument("--older-than", type=float, metavar="DAYS", default=load_settings()["archive_after_days"] or 30)
+    command = commands.add_parser("sync", help="exchange changes with a sync server once")
+    command.add_argument("--server", default=SYNC_SERVER or load_settings()["sync_server"])
+    command = commands.add_parser("serve", help="run the reference sync server")
+    command.add_argument("--host", default="127.0.0.1")
+    command.add_argument("--port", type=int, default=SYNC_PORT)
+    command.add_argument("--store", default="sync_server.db", help="SQLite file of the server")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        return cli_serve(args.store, args.host, args.port)
+    if args.command == "sync" and not args.server:
+        parser.error("sync needs --server, TODO_PYTHON_SYNC or sync_server in settings.json")
+    filters = (args.status, args.priority, args.older_than) if args.command not in ("import", "archive", "sync") else ()
+    if args.command == "delete" and not args.all and filters == (None, None, None):
+        parser.error("delete needs a filter, or --all")
+    matches = task_filter(*filters)
+
+    store = open_store(args.data)
+    try:
+        if args.command == "import":
+            count, rejected = cli_import(store, args.file, file_format(args.file, args.format))
+            print(f"✅ {count} tasks imported", file=sys.stderr)
+            if rejected:
+                print(f"⚠️ {rejected} rows skipped", file=sys.stderr)
+                return 1
+        elif args.command == "export":
+            count = cli_export(store, args.file, file_format(args.file, args.format), matches)
+            print(f"✅ {count} tasks exported", file=sys.stderr)
+        elif args.command == "archive":
+            print(f"✅ {cli_archive(store, args.older_than)} tasks archived", file=sys.stderr)
+        elif args.command == "sync":
+            pushed, applied = cli_sync(store, args.server)
+            print(f"✅ {pushed} changes sent, {applied} received", file=sys.stderr)
+        elif args.command == "move":
+            print(f"✅ {cli_move(store, matches, args.to)} tasks moved to {args.to}", file=sys.stderr)
+        else:
+            print(f"✅ {cli_delete(store, matches)} tasks deleted", file=sys.stderr)
+    except BrokenPipeError:
+        # Output piped into head and the like
+        return 1
+    except (OSError, ValueError, KeyError, csv.Error) as e:
+        print(f"⚠️ {args.command} failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    return 0
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    sys.exit(cli_main(sys.argv[1:]))
+
+# Everything below is the window, the headless mode never gets here
+import customtkinter as ctk
+import tkinter as tk
+import tkinter.messagebox
+
+THEME_SUFFIX = ".ctheme"
+THEME_POLL_MS = 1000
+DIALOG_PREWARM_MS = 200
+# Room left for the taskbar and the title bar when a dialog is fitted to the screen
+DIALOG_SCREEN_MARGIN = 120
+THEME_KEYS = ("ADD_TO_MENU", "MENU_NAME", "BACKCOLOR", "BACKCOLOR.GRADIENT", "CUSTOM.STATUSES")
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Compiled style table: color roles used by the widgets, plus the column titles
+DEFAULT_STYLE = {
+    "name": "Default",
+    "path": None,
+    "menu": True,
+    "window": tuple(ctk.ThemeManager.theme["CTk"]["fg_color"]),
+    "loading": ("gray95", "gray10"),
+    "header": ("gray90", "gray13"),
+    "accent": ("#1e40af", "#3b82f6"),
+    "accent_hover": ("#2563eb", "#1d4ed8"),
+    "secondary": ("gray75", "gray25"),
+    "secondary_hover": ("gray65", "gray35"),
+    "card": ("gray92", "gray14"),
+    "card_border": ("gray80", "gray25"),
+    "card_button": ("gray80", "gray30"),
+    "card_button_hover": ("gray70", "gray40"),
+    "muted_text": ("gray50", "gray60"),
+    "columns": (("#ef4444", "#dc2626"), ("#f59e0b", "#d97706"), ("#10b981", "#059669")),
+    "column_names": tuple(STATUSES)
+}
+THEME_CACHE = {}
+# What reading a bad .ctheme file can raise (unreadable, not UTF-8, odd values),
+# such a file is reported and skipped
+THEME_ERRORS = (OSError, ValueError, TypeError, SyntaxError)
+
+def strip_comment(line):
+    quote = None
+    for index, char in enumerate(line):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "#":
+            return line[:index]
+    return line
+
+def parse_ctheme(text):
+    # One KEY = <literal> per line, values go through ast.literal_eval, never exec
+    import ast
+
+    values = {}
+    errors = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = strip_comment(line).strip()
+        if not line:
+            continue
+        key, sep, value = line.partition("=")
+        key = key.strip()
+        if not sep or key not in THEME_KEYS:
+            errors.append(f"line {number}: unknown setting {key!r}")
+            continue
+        try:
+            values[key] = ast.literal_eval(value.strip())
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            errors.append(f"line {number}: {key} is not a valid value")
+    return values, errors
+
+def theme_color(value):
+    # (r, g, b) or any color name Tk understands
+    if isinstance(value, str) and value:
+        return value
+    if isinstance(value, tuple) and len(value) == 3 and all(isinstance(c, int) and 0 <= c <= 255 for c in value):
+        return "#{:02x}{:02x}{:02x}".format(*value)
+    raise ValueError(f"{value!r} is not a color")
+
+def compile_theme(values, path, errors):
+    style = dict(DEFAULT_STYLE)
+    style["path"] = path
+    style["name"] = str(values.get("MENU_NAME") or os.path.splitext(os.path.basename(path))[0])
+    style["menu"] = bool(values.get("ADD_TO_MENU", True))
+    try:
+        if "BACKCOLOR" in values:
+            style["window"] = style["loading"] = theme_color(values["BACKCOLOR"])
+        if "BACKCOLOR.GRADIENT" in values:
+            # Tk has no gradients: the window takes the first stop, the header the last
+            stops = re.findall(r"\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)", str(values["BACKCOLOR.GRADIENT"]))
+            if len(stops) < 2:
+                raise ValueError("BACKCOLOR.GRADIENT needs two colors")
+            style["window"] = theme_color(tuple(int(c) for c in stops[0]))
+            style["header"] = theme_color(tuple(int(c) for c in stops[-1]))
+    except ValueError as e:
+        errors.append(str(e))
+    statuses = values.get("CUSTOM.STATUSES")
+    if isinstance(statuses, (list, tuple)):
+        # Custom names replace the titles of the first two columns, the data keeps its statuses
+        names = [str(name) for name in statuses[:2]]
+        style["column_names"] = tuple(names) + DEFAULT_STYLE["column_names"][len(names):]
+    return style
+
+def load_theme(path):
+    # Compiled once per file version, keyed on path and mtime
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = THEME_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, encoding="utf-8") as f:
+        values, errors = parse_ctheme(f.read())
+    style = compile_theme(values, path, errors)
+    for error in errors:
+        print(f"⚠️ {os.path.basename(path)}, {error}")
+    THEME_CACHE[path] = (mtime, style)
+    return style
+
+def find_themes(directories=None):
+    themes = []
+    for directory in dict.fromkeys(directories or (APP_DIR, os.getcwd())):
+        try:
+            names = sorted(name for name in os.listdir(directory) if name.endswith(THEME_SUFFIX))
+        except OSError:
+            continue
+        for name in names:
+            try:
+                themes.append(load_theme(os.path.join(directory, name)))
+            except THEME_ERRORS as e:
+                print(f"⚠️ Could not read theme {name}: {e}")
+    return themes
+
+class TaskCard(ctk.CTkFrame):
+    # Card widgets are built once and rebound to whichever task they show
+    def __init__(self, master, app):
+        super().__init__(
+            master,
+            height=CARD_HEIGHT,
+            corner_radius=10,
+            fg_color=app.style["card"],
+            border_width=1,
+            border_color=app.style["card_border"]
+        )
+        self.pack_propagate(False)
+        self.app = app
+        self.task = None
+        self.shown = {}
+        
+        # Task title
+        self.title_label = ctk.CTkLabel(self, text="", font=app.fonts["card_title"], anchor="w")
+        self.title_label.pack(fill="x", padx=15, pady=(15, 5))
+        
+        # Priority indicator
+        priority_frame = ctk.CTkFrame(self, fg_color="transparent")
+        priority_frame.pack(fill="x", padx=15)
+        
+        self.priority_badge = ctk.CTkLabel(
+            priority_frame,
+            text="",
+            font=app.fonts["card_badge"],
+            corner_radius=15,
+            width=80,
+            height=25
+        )
+        self.priority_badge.pack(side="left")
+        
+        # Description preview
+        self.desc_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=app.fonts["card_description"],
+            text_color=app.style["muted_text"],
+            anchor="w"
+        )
+        
+        # Action buttons, commands always act on the currently bound task
+        self.btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.btn_frame.pack(fill="x", padx=15, pady=(5, 15))
+        
+        self.edit_btn = ctk.CTkButton(
+            self.btn_frame,
+            text="✏️",
+            width=30,
+            height=25,
+            corner_radius=5,
+            command=lambda: self.app.edit_task(self.task),
+            fg_color=app.style["card_button"],
+            hover_color=app.style["card_button_hover"]
+        )
+        self.edit_btn.pack(side="left", padx=(0, 5))
+        
+        delete_btn = ctk.CTkButton(
+            self.btn_frame,
+            text="🗑️",
+            width=30,
+            height=25,
+            corner_radius=5,
+            command=lambda: self.app.delete_task(self.task),
+            fg_color=("#ef4444", "#dc2626"),
+            hover_color=("#dc2626", "#b91c1c")
+        )
+        delete_btn.pack(side="left")
+        
+        self.move_btn = ctk.CTkButton(
+            self.btn_frame,
+            text="➡️",
+            width=30,
+            height=25,
+            corner_radius=5,
+            command=lambda: self.app.move_task(self.task, 1),
+            fg_color=("#10b981", "#059669")
+        )
+        
+        self.back_btn = ctk.CTkButton(
+            self.btn_frame,
+            text="⬅️",
+            width=30,
+            height=25,
+            corner_radius=5,
+            command=lambda: self.app.move_task(self.task, -1),
+            fg_color=("#6b7280", "#4b5563")
+        )
+        
+        # Click selects the card for the batch actions, shift-click the range up to it
+        for widget in (self, self.title_label, self.desc_label):
+            widget.bind("<Button-1>", lambda e: self.app.toggle_selected(self.task))
+            widget.bind("<Shift-Button-1>", lambda e: self.app.select_range(self.task))
+    
+    def show_task(self, task):
+        self.task = task
+        self.show_selected(task.id in self.app.selected)
+        self.update_widget(self.title_label, "title", text=task.title)
+        self.update_widget(
+            self.priority_badge, "priority",
+            text=f"🔥 {task.priority_name}",
+            fg_color=PRIORITY_COLORS[task.priority_name]
+        )
+        
+        description = task.preview
+        if description:
+            self.update_widget(self.desc_label, "description", text=description)
+        if self.shown.get("has_description") != bool(description):
+            self.shown["has_description"] = bool(description)
+            if description:
+                self.desc_label.pack(fill="x", padx=15, pady=5, before=self.btn_frame)
+            else:
+                self.desc_label.pack_forget()
+        
+        # Move buttons depend on the column the task sits in
+        moves = (task.status != len(STATUSES) - 1, task.status != 0)
+        if self.shown.get("moves") != moves:
+            self.shown["moves"] = moves
+            self.move_btn.pack_forget()
+            self.back_btn.pack_forget()
+            if moves[0]:
+                self.move_btn.pack(side="right")
+            if moves[1]:
+                self.back_btn.pack(side="right", padx=(5, 0))
+    
+    def show_selected(self, selected):
+        self.update_widget(
+            self, "selected",
+            border_width=3 if selected else 1,
+            border_color=self.app.style["accent"] if selected else self.app.style["card_border"]
+        )
+    
+    def apply_style(self, style):
+        self.shown.pop("selected", None)
+        self.configure(fg_color=style["card"])
+        self.show_selected(self.task is not None and self.task.id in self.app.selected)
+        self.desc_label.configure(text_color=style["muted_text"])
+        self.edit_btn.configure(fg_color=style["card_button"], hover_color=style["card_button_hover"])
+    
+    def update_widget(self, widget, name, **options):
+        # Reconfiguring redraws the widget, skip it when nothing changed
+        if self.shown.get(name) != options:
+            widget.configure(**options)
+            self.shown[name] = options
+
+class VirtualTaskList(ctk.CTkFrame):
+    # Scrollable list that only builds cards for the rows in the viewport
+    # rows is shared with the repository bucket it shows, never copied
+    def __init__(self, master, build_card, rows, row_height=CARD_HEIGHT + CARD_SPACING, overscan=OVERSCAN_ROWS, **kwargs):
+        super().__init__(master, **kwargs)
+        self.build_card = build_card
+        self.row_height = row_height
+        self.overscan = overscan
+        self.rows = rows
+        self.visible = {}
+        self.free = []
+        self.offset = 0
+        self.cards_built = 0
+        self.cards_rebound = 0
 
-# Fonction pour calculer le hash SHA256 du fichier donné
-def file_hash(filepath):
-    if not os.path.exists(filepath):
-        return None
-    with open(filepath, "rb") as f:
-        return hashlib.sha256(f.read()).hexdigest()
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.viewport.bind("<Configure>", lambda e: self.render())
 
-# Fonction principale de mise à jour
-def check_for_update():
-    local_file = os.path.realpath(__file__)
-    try:
-        with urllib.request.urlopen(UPDATE_URL) as response:
-            latest_code = response.read()
-            latest_hash = hashlib.sha256(latest_code).hexdigest()
-
-        current_hash = file_hash(local_file)
-
-        if latest_hash != current_hash:
-            print("🔁 Mise à jour disponible ! Mise à jour en cours...")
-            with open(local_file, "wb") as f:
-                f.write(latest_code)
-            print("✅ Mise à jour terminée. Redémarrage...")
-            os.execv(sys.executable, ['python'] + sys.argv)
+        root = self.winfo_toplevel()
+        if sys.platform.startswith("linux"):
+            root.bind_all("<Button-4>", self.on_mouse_wheel, add="+")
+            root.bind_all("<Button-5>", self.on_mouse_wheel, add="+")
         else:
-            print("🟢 Aucune mise à jour nécessaire.")
-    except Exception as e:
-        print(f"⚠️ Erreur lors de la vérification des mises à jour : {e}")
+            root.bind_all("<MouseWheel>", self.on_mouse_wheel, add="+")
 
-check_for_update()
+    def cards(self):
+        # Every card this list owns, shown or pooled
+        return [*self.visible.values(), *self.free]
 
+    def set_rows(self, rows):
+        # Switch between the repository bucket and a filtered view
+        for task_id in list(self.visible):
+            self.release(self.visible.pop(task_id))
+        self.rows = rows
+        self.offset = 0
+        self.render()
 
-# Constants
-DATA_FILE = "tasks.json"
-STATUSES = ["Todo", "InProgress", "Done"]
-PRIORITIES = ["Low", "Important", "Urgent"]
+    def forget(self, task_id):
+        # The row left this list, its card goes back to the pool
+        card = self.visible.pop(task_id, None)
+        if card is not None:
+            self.release(card)
+
+    def invalidate(self, task_id):
+        card = self.visible.get(task_id)
+        if card is not None:
+            card.show_task(card.task)
+
+    def acquire(self, task):
+        # Reuse a detached card when possible, widget creation is the slow part
+        if self.free:
+            card = self.free.pop()
+            self.cards_rebound += 1
+        else:
+            card = self.build_card(self.viewport)
+            self.cards_built += 1
+        card.show_task(task)
+        return card
+
+    def release(self, card):
+        card.place_forget()
+        card.task = None
+        self.free.append(card)
+
+    def viewport_height(self):
+        return self.viewport.winfo_height() / self._get_widget_scaling()
+
+    def render(self):
+        height = self.viewport_height()
+        total = len(self.rows) * self.row_height
+        self.offset = max(0, min(self.offset, total - height))
+
+        first = max(0, int(self.offset // self.row_height) - self.overscan)
+        last = min(len(self.rows), int((self.offset + height) // self.row_height) + 1 + self.overscan)
+        window = self.rows[first:last]
+
+        # Recycle cards that scrolled out for the rows that scrolled in
+        wanted = {task.id for task in window}
+        for task_id in [task_id for task_id in self.visible if task_id not in wanted]:
+            self.release(self.visible.pop(task_id))
+        for index, task in enumerate(window, first):
+            card = self.visible.get(task.id)
+            if card is None:
+                card = self.visible[task.id] = self.acquire(task)
+            card.place(x=0, y=index * self.row_height - self.offset, relwidth=1)
+
+        # Keep the pool no larger than one extra window of cards
+        while len(self.free) > last - first:
+            self.free.pop().destroy()
+
+        if total > height:
+            self.scrollbar.set(self.offset / total, (self.offset + height) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, offset):
+        self.offset = offset
+        self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.rows) * self.row_height)
+        elif unit == "pages":
+            self.scroll_to(self.offset + int(amount) * self.viewport_height())
+        else:
+            self.scroll_to(self.offset + int(amount) * self.row_height / 3)
+
+    def on_mouse_wheel(self, event):
+        # Wheel events are bound globally, only react when over this list
+        widget = event.widget
+        while widget is not None and widget is not self:
+            widget = getattr(widget, "master", None)
+        if widget is None:
+            return
+        if event.num == 4:
+            delta = -1
+        elif event.num == 5:
+            delta = 1
+        elif sys.platform == "darwin":
+            delta = -event.delta
+        else:
+            delta = -int(event.delta / 40)
+        self.on_scrollbar("scroll", delta, "units")
 
 class ModernTodoApp(ctk.CTk):
     def __init__(self):
         super().__init__()
         self.setup_window()
-        self.tasks = self.load_tasks()
+        self.settings = load_settings()
+        METRICS.enabled = METRICS.enabled and self.settings["collect_metrics"]
+        self.store = open_store(migrate=True)
+        self.writer = PersistenceWorker(self.store)
+        self.repo = TaskRepository(RUNTIME_SEQ_START)
+        self.search_index = SearchIndex()
+        self.search_terms = ()
+        self.views = {}
+        # Sort and filter menu of each column, built on first use
+        self.view_menus = {}
+        self.search_job = None
+        # Column counts from the store while the board streams in
+        self.store_counts = None
+        self.selected = set()
+        self.select_anchor = None
+        self.history = History(self.repo)
+        self.dialogs = {}
+        self.repo.listeners.append(self.history.record)
+        self.repo.listeners.append(self.persist)
+        self.repo.listeners.append(self.search_index.apply_changes)
+        self.repo.listeners.append(self.refresh_cards)
+        self.repo.listeners.append(self.forget_deleted)
+        self.watcher = None
+        self.external_queue = queue.Queue()
+        self.archive = TaskArchive(self.store.path)
+        self.archived_ids = set()
+        # Archived tasks shown only as hits of the current search
+        self.archive_hits = set()
+        self.archive_pages = 0
+        self.archive_loading = False
+        self.sync = None
+        sync_server = SYNC_SERVER or self.settings["sync_server"]
+        if sync_server:
+            self.sync = SyncClient(self.store.path, sync_server, self.sync_lookup, self.sync_ids)
+            self.writer.outbox = self.sync.outbox_path
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.style = DEFAULT_STYLE
+        self.theme_path = None
+        # Last error of the active theme file, reported once and not every poll
+        self.theme_error = None
+        self.styled_widgets = []
         self.setup_ui()
+        self.set_theme(self.settings["theme"])
+        self.after(THEME_POLL_MS, self.watch_theme)
         self.show_loading()
+        if self.settings["check_for_updates"]:
+            start_update_check()
         
     def setup_window(self):
         self.title("Ultra Modern Todo")
@@ -88,15 +3282,14 @@ class ModernTodoApp(ctk.CTk):
         self.main_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
         # Animated header
-        self.header_frame = ctk.CTkFrame(self.main_frame, height=100, fg_color=("gray90", "gray13"))
+        self.header_frame = ctk.CTkFrame(self.main_frame, height=100)
         self.header_frame.pack(fill="x", pady=(0, 20))
         self.header_frame.pack_propagate(False)
         
         self.title_label = ctk.CTkLabel(
             self.header_frame, 
             text="✨ Todo Python", 
-            font=ctk.CTkFont(size=32, weight="bold"),
-            text_color=("#1e40af", "#3b82f6")
+            font=ctk.CTkFont(size=32, weight="bold")
         )
         self.title_label.pack(expand=True)
         
@@ -110,8 +3303,7 @@ class ModernTodoApp(ctk.CTk):
             command=self.show_add_dialog,
             font=ctk.CTkFont(size=14, weight="bold"),
             height=40,
-            corner_radius=20,
-            hover_color=("#2563eb", "#1d4ed8")
+            corner_radius=20
         )
         self.add_btn.pack(side="left", padx=(0, 10))
         
@@ -121,12 +3313,53 @@ class ModernTodoApp(ctk.CTk):
             command=self.show_settings,
             font=ctk.CTkFont(size=14, weight="bold"),
             height=40,
-            corner_radius=20,
-            fg_color=("gray75", "gray25"),
-            hover_color=("gray65", "gray35")
+            corner_radius=20
         )
         self.settings_btn.pack(side="left")
         
+        # Batch actions on the selected cards, shown while there is a selection
+        self.batch_bar = ctk.CTkFrame(self.controls_frame, fg_color="transparent")
+        self.selection_label = ctk.CTkLabel(self.batch_bar, text="", font=ctk.CTkFont(size=14, weight="bold"))
+        self.selection_label.pack(side="left", padx=(0, 10))
+        self.batch_move_menu = ctk.CTkOptionMenu(
+            self.batch_bar, values=STATUSES, command=self.batch_move, width=120, height=40, corner_radius=20
+        )
+        self.batch_move_menu.pack(side="left", padx=(0, 10))
+        self.batch_priority_menu = ctk.CTkOptionMenu(
+            self.batch_bar, values=PRIORITIES, command=self.batch_priority, width=120, height=40, corner_radius=20
+        )
+        self.batch_priority_menu.pack(side="left", padx=(0, 10))
+        ctk.CTkButton(
+            self.batch_bar,
+            text="🗑️ Delete",
+            command=self.batch_delete,
+            width=100,
+            height=40,
+            corner_radius=20,
+            fg_color=("#ef4444", "#dc2626"),
+            hover_color=("#dc2626", "#b91c1c")
+        ).pack(side="left", padx=(0, 10))
+        self.clear_selection_btn = ctk.CTkButton(
+            self.batch_bar, text="✖", command=self.clear_selection, width=40, height=40, corner_radius=20
+        )
+        self.clear_selection_btn.pack(side="left")
+        self.bind("<Escape>", self.clear_selection)
+        self.bind("<Control-z>", self.undo)
+        self.bind("<Control-y>", self.redo)
+        self.bind("<Control-Z>", self.redo)
+        
+        # Filters the columns as you type, Escape clears it
+        self.search_entry = ctk.CTkEntry(
+            self.controls_frame,
+            placeholder_text="🔍 Search tasks...",
+            width=280,
+            height=40,
+            corner_radius=20
+        )
+        self.search_entry.pack(side="right")
+        self.search_entry.bind("<KeyRelease>", self.on_search_changed)
+        self.search_entry.bind("<Escape>", self.clear_search)
+        
         # Task board with responsive columns
         self.board_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         self.board_frame.pack(fill="both", expand=True)
@@ -136,170 +3369,319 @@ class ModernTodoApp(ctk.CTk):
             self.board_frame.grid_columnconfigure(i, weight=1, uniform="col")
         self.board_frame.grid_rowconfigure(0, weight=1)
         
+        # Shared by every task card instead of being rebuilt per card
+        self.fonts = {
+            "card_title": ctk.CTkFont(size=14, weight="bold"),
+            "card_badge": ctk.CTkFont(size=12),
+            "card_description": ctk.CTkFont(size=11)
+        }
+        
         self.columns = {}
         self.create_columns()
+        
+        # Color roles of the long-lived widgets, restyled in place on a theme switch
+        self.add_styled(self, fg_color="window")
+        self.add_styled(self.header_frame, fg_color="header")
+        self.add_styled(self.title_label, text_color="accent")
+        self.add_styled(self.add_btn, hover_color="accent_hover")
+        self.add_styled(self.settings_btn, fg_color="secondary", hover_color="secondary_hover")
+        self.add_styled(self.clear_selection_btn, fg_color="secondary", hover_color="secondary_hover")
         self.update_board()
         
     def create_columns(self):
-        colors = [("#ef4444", "#dc2626"), ("#f59e0b", "#d97706"), ("#10b981", "#059669")]
-        
         for i, status in enumerate(STATUSES):
             # Column container
             col = ctk.CTkFrame(self.board_frame, corner_radius=15)
             col.grid(row=0, column=i, padx=10, pady=10, sticky="nsew")
             
             # Header with status indicator
-            header = ctk.CTkFrame(col, height=60, fg_color=colors[i], corner_radius=10)
+            header = ctk.CTkFrame(col, height=60, fg_color=self.style["columns"][i], corner_radius=10)
             header.pack(fill="x", padx=10, pady=(10, 5))
             header.pack_propagate(False)
             
             title = ctk.CTkLabel(
                 header, 
-                text=f"{status} ({len([t for t in self.tasks if t['status'] == status])})",
+                text=f"{self.style['column_names'][i]} ({self.repo.count(i)})",
                 font=ctk.CTkFont(size=16, weight="bold"),
                 text_color="white"
             )
             title.pack(expand=True)
             
-            # Scrollable task area
-            scroll = ctk.CTkScrollableFrame(col, fg_color="transparent")
-            scroll.pack(fill="both", expand=True, padx=10, pady=(5, 10))
+            select_btn = ctk.CTkButton(
+                header,
+                text="☑",
+                width=28,
+                height=28,
+                corner_radius=8,
+                fg_color="transparent",
+                hover_color=self.style["columns"][i],
+                text_color="white",
+                command=lambda status=i: self.select_column(status)
+            )
+            select_btn.place(relx=1, rely=0.5, x=-8, anchor="e")
+            
+            view_btn = ctk.CTkButton(
+                header,
+                text="⇅",
+                width=28,
+                height=28,
+                corner_radius=8,
+                fg_color="transparent",
+                hover_color=self.style["columns"][i],
+                text_color="white",
+                command=lambda status=i: self.show_view_menu(status)
+            )
+            view_btn.place(relx=0, rely=0.5, x=8, anchor="w")
+            
+            # Archived tasks are paged back in on demand
+            if i == ARCHIVE_STATUS:
+                self.older_btn = ctk.CTkButton(col, text="", height=28, corner_radius=10, command=self.load_older)
+                self.add_styled(self.older_btn, fg_color="secondary", hover_color="secondary_hover")
+            
+            # Virtualized task area: only the visible cards exist as widgets
+            task_list = VirtualTaskList(col, self.create_task_card, self.repo.rows(i), fg_color="transparent")
+            task_list.pack(fill="both", expand=True, padx=10, pady=(5, 10))
             
-            self.columns[status] = {"frame": col, "header": header, "title": title, "scroll": scroll}
+            self.columns[i] = {"frame": col, "header": header, "title": title, "list": task_list, "select": select_btn, "view": view_btn}
+        self.rebuild_views(self.columns)
+        self.update_older_button()
     
     def update_board(self):
-        # Clear existing tasks
-        for status_data in self.columns.values():
-            for widget in status_data["scroll"].winfo_children():
-                widget.destroy()
-        
-        # Group tasks by status
-        tasks_by_status = {status: [] for status in STATUSES}
-        for task in self.tasks:
-            if task["status"] in tasks_by_status:
-                tasks_by_status[task["status"]].append(task)
-        
-        # Create task cards with animations
-        for status, tasks in tasks_by_status.items():
-            # Update header count
-            self.columns[status]["title"].configure(
-                text=f"{status} ({len(tasks)})"
+        with METRICS.span("update_board"):
+            self.refresh_columns(self.columns, self.columns)
+    
+    def refresh_cards(self, changes):
+        # Reconcile the board with repository changes, only the affected
+        # cards and header counts are touched
+        with METRICS.span("refresh_cards"):
+            self.reconcile(changes)
+    
+    def reconcile(self, changes):
+        touched = set()
+        redraw = set()
+        for event, task, old_status, fields in changes:
+            if self.views.get(old_status) is not None or self.views.get(task.status) is not None:
+                # Sorted or filtered rows follow the change, the card is rebound on render
+                self.refilter(event, task, old_status)
+                if old_status in self.columns:
+                    self.columns[old_status]["list"].forget(task.id)
+                touched.add(old_status)
+                touched.add(task.status)
+            elif event == "add":
+                touched.add(task.status)
+            elif event == "delete" or old_status != task.status:
+                if old_status in self.columns:
+                    self.columns[old_status]["list"].forget(task.id)
+                touched.add(old_status)
+                touched.add(task.status)
+            elif task.status in self.columns:
+                self.columns[task.status]["list"].invalidate(task.id)
+                redraw.add(task.status)
+        self.refresh_columns(touched, touched | redraw)
+    
+    def refresh_columns(self, counted, rendered):
+        for status in counted:
+            if status in self.columns:
+                count = self.repo.count(status)
+                if self.store_counts is not None:
+                    count = max(count, self.store_counts.get(status, 0))
+                view = self.views.get(status)
+                if view is not None and view.filtering:
+                    count = f"{len(view.rows)}/{count}"
+                self.columns[status]["title"].configure(text=f"{self.style['column_names'][status]} ({count})")
+        for status in rendered:
+            if status in self.columns:
+                self.columns[status]["list"].render()
+    
+    def on_search_changed(self, event=None):
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self.apply_search)
+    
+    def clear_search(self, event=None):
+        self.search_entry.delete(0, "end")
+        self.on_search_changed()
+    
+    def apply_search(self):
+        self.search_job = None
+        terms = query_terms(self.search_entry.get())
+        if terms == self.search_terms:
+            return
+        with METRICS.span("search"):
+            self.drop_archive_hits()
+            self.filter_board(terms)
+        if terms and self.archive.segments():
+            threading.Thread(target=self.search_archive, args=(terms,), daemon=True).start()
+    
+    def filter_board(self, terms):
+        self.search_terms = terms
+        self.rebuild_views(self.columns)
+    
+    def rebuild_views(self, statuses):
+        # The plain bucket for a column in board order without filters, a
+        # ColumnView otherwise
+        ids = self.search_index.search(self.search_terms) if self.search_terms else None
+        # Every task matches: the buckets are taken whole
+        every = ids is not None and len(ids) == len(self.repo)
+        matches = None
+        if ids is not None:
+            terms = self.search_terms
+            matches = lambda task_id: self.search_index.matches(task_id, terms)
+        hits = None
+        if ids is not None and len(ids) * 8 < len(self.repo):
+            # Few hits: take them in sequence order directly
+            hits = {status: ([], []) for status in statuses}
+            for seq, task_id in sorted((self.repo.seq[task_id], task_id) for task_id in ids):
+                task = self.repo.by_id[task_id]
+                if task.status in hits:
+                    hits[task.status][0].append(seq)
+                    hits[task.status][1].append(task)
+        for status in statuses:
+            mode = self.settings["column_views"].get(STATUS_NAMES[status], {})
+            sort = mode.get("sort") if mode.get("sort") in SORT_MODES else "Manual"
+            priorities = mode.get("priorities")
+            age = AGE_FILTERS.get(mode.get("age"))
+            if sort == "Manual" and priorities is None and age is None and ids is None:
+                self.views[status] = None
+                self.columns[status]["list"].set_rows(self.repo.rows(status))
+                continue
+            view = ColumnView(
+                self.repo.seq,
+                sort,
+                None if priorities is None else {PRIORITY_CODES[name] for name in priorities if name in PRIORITY_CODES},
+                age,
+                matches
             )
-            
-            for task in tasks:
-                self.create_task_card(self.columns[status]["scroll"], task)
-    
-    def create_task_card(self, parent, task):
-        # Priority colors
-        priority_colors = {
-            "Low": ("#10b981", "#059669"),
-            "Important": ("#f59e0b", "#d97706"),
-            "Urgent": ("#ef4444", "#dc2626")
-        }
-        
-        # Card container with hover effects
-        card = ctk.CTkFrame(
-            parent, 
-            corner_radius=10,
-            fg_color=("gray92", "gray14"),
-            border_width=1,
-            border_color=("gray80", "gray25")
-        )
-        card.pack(fill="x", pady=5)
-        
-        # Task title
-        title = ctk.CTkLabel(
-            card,
-            text=task["title"],
-            font=ctk.CTkFont(size=14, weight="bold"),
-            anchor="w"
-        )
-        title.pack(fill="x", padx=15, pady=(15, 5))
-        
-        # Priority indicator
-        priority_frame = ctk.CTkFrame(card, fg_color="transparent")
-        priority_frame.pack(fill="x", padx=15)
-        
-        priority_badge = ctk.CTkLabel(
-            priority_frame,
-            text=f"🔥 {task['priority']}",
-            font=ctk.CTkFont(size=12),
-            fg_color=priority_colors[task["priority"]],
-            corner_radius=15,
-            width=80,
-            height=25
-        )
-        priority_badge.pack(side="left")
-        
-        # Description preview
-        if task["description"]:
-            desc = ctk.CTkLabel(
-                card,
-                text=task["description"][:50] + ("..." if len(task["description"]) > 50 else ""),
-                font=ctk.CTkFont(size=11),
-                text_color=("gray50", "gray60"),
-                anchor="w"
+            if hits is not None:
+                view.build(*hits[status])
+            else:
+                seqs, rows = self.repo.bucket(status)
+                # Most tasks match: one pass over the bucket is cheaper than sorting
+                view.build(seqs, rows, None if ids is None or every else [task.id in ids for task in rows])
+            self.views[status] = view
+            self.columns[status]["list"].set_rows(view.rows)
+        self.refresh_columns(statuses, ())
+    
+    def refilter(self, event, task, old_status):
+        view = self.views.get(old_status)
+        if view is not None:
+            view.discard(task.id)
+        view = self.views.get(task.status)
+        if event != "delete" and view is not None:
+            view.place(task, self.repo.seq[task.id])
+    
+    def show_view_menu(self, status):
+        # Sort and filter choices of one column, kept in settings.json. The menu
+        # and its variables are kept on the window, a Tk variable is unset as
+        # soon as its Python object is collected and the marks would go with it.
+        if status not in self.view_menus:
+            self.view_menus[status] = self.build_view_menu(status)
+        menu, sort, shown, age = self.view_menus[status]
+        mode = self.settings["column_views"].get(STATUS_NAMES[status], {})
+        sort.set(mode.get("sort", "Manual"))
+        for name, variable in shown.items():
+            variable.set(mode.get("priorities") is None or name in mode["priorities"])
+        age.set(mode.get("age", "Any age"))
+        button = self.columns[status]["view"]
+        menu.tk_popup(button.winfo_rootx(), button.winfo_rooty() + button.winfo_height())
+    
+    def build_view_menu(self, status):
+        menu = tk.Menu(self, tearoff=False)
+        sort = tk.StringVar(menu)
+        for name in SORT_MODES:
+            menu.add_radiobutton(
+                label=f"Sort: {name}", variable=sort, value=name,
+                command=lambda name=name: self.set_column_view(status, sort=name)
             )
-            desc.pack(fill="x", padx=15, pady=5)
-        
-        # Action buttons
-        btn_frame = ctk.CTkFrame(card, fg_color="transparent")
-        btn_frame.pack(fill="x", padx=15, pady=(5, 15))
-        
-        edit_btn = ctk.CTkButton(
-            btn_frame,
-            text="✏️",
-            width=30,
-            height=25,
-            corner_radius=5,
-            command=lambda: self.edit_task(task),
-            fg_color=("gray80", "gray30"),
-            hover_color=("gray70", "gray40")
-        )
-        edit_btn.pack(side="left", padx=(0, 5))
-        
-        delete_btn = ctk.CTkButton(
-            btn_frame,
-            text="🗑️",
-            width=30,
-            height=25,
-            corner_radius=5,
-            command=lambda: self.delete_task(task),
-            fg_color=("#ef4444", "#dc2626"),
-            hover_color=("#dc2626", "#b91c1c")
-        )
-        delete_btn.pack(side="left")
-        
-        # Move buttons (with smooth transitions)
-        if task["status"] != STATUSES[-1]:
-            move_btn = ctk.CTkButton(
-                btn_frame,
-                text="➡️",
-                width=30,
-                height=25,
-                corner_radius=5,
-                command=lambda: self.move_task(task, 1),
-                fg_color=("#10b981", "#059669")
+        menu.add_separator()
+        shown = {name: tk.BooleanVar(menu) for name in PRIORITIES}
+        for name, variable in shown.items():
+            menu.add_checkbutton(
+                label=f"Show {name}", variable=variable,
+                command=lambda: self.set_column_view(status, priorities=[name for name, variable in shown.items() if variable.get()])
             )
-            move_btn.pack(side="right")
-        
-        if task["status"] != STATUSES[0]:
-            back_btn = ctk.CTkButton(
-                btn_frame,
-                text="⬅️",
-                width=30,
-                height=25,
-                corner_radius=5,
-                command=lambda: self.move_task(task, -1),
-                fg_color=("#6b7280", "#4b5563")
+        menu.add_separator()
+        age = tk.StringVar(menu)
+        for name in AGE_FILTERS:
+            menu.add_radiobutton(
+                label=name, variable=age, value=name,
+                command=lambda name=name: self.set_column_view(status, age=name)
             )
-            back_btn.pack(side="right", padx=(5, 0))
+        return menu, sort, shown, age
+    
+    def set_column_view(self, status, **changes):
+        with METRICS.span("column_view"):
+            mode = {**self.settings["column_views"].get(STATUS_NAMES[status], {}), **changes}
+            if mode.get("priorities") is not None:
+                mode["priorities"] = [name for name in PRIORITIES if name in mode["priorities"]]
+                if len(mode["priorities"]) == len(PRIORITIES):
+                    del mode["priorities"]
+            if mode.get("sort") == "Manual":
+                del mode["sort"]
+            if mode.get("age") == "Any age":
+                del mode["age"]
+            self.settings["column_views"] = {**self.settings["column_views"], STATUS_NAMES[status]: mode}
+            self.rebuild_views((status,))
+        save_settings(self.settings)
+    
+    def add_styled(self, widget, **roles):
+        self.styled_widgets.append((widget, roles))
+        widget.configure(**{option: self.style[role] for option, role in roles.items()})
+    
+    def set_theme(self, path):
+        # None is the built-in look
+        style = DEFAULT_STYLE
+        if path:
+            try:
+                style = load_theme(path)
+            except THEME_ERRORS as e:
+                print(f"⚠️ Could not load theme {path}: {e}")
+                path = None
+        self.theme_path = path
+        self.apply_theme(style)
+    
+    def apply_theme(self, style):
+        # One reconfigure per existing widget, nothing is rebuilt
+        with METRICS.span("apply_theme"):
+            self.style = style
+            for widget, roles in self.styled_widgets:
+                widget.configure(**{option: style[role] for option, role in roles.items()})
+            for status, column in self.columns.items():
+                column["header"].configure(fg_color=style["columns"][status])
+                column["select"].configure(hover_color=style["columns"][status])
+                column["view"].configure(hover_color=style["columns"][status])
+                for card in column["list"].cards():
+                    card.apply_style(style)
+            self.refresh_columns(self.columns, ())
+    
+    def watch_theme(self):
+        # Edits to the active .ctheme file show up without a restart
+        try:
+            if self.theme_path:
+                style = load_theme(self.theme_path)
+                if style is not self.style:
+                    self.apply_theme(style)
+            self.theme_error = None
+        except THEME_ERRORS as e:
+            # Half saved or broken, the current look stays until the file is fixed
+            if str(e) != self.theme_error:
+                print(f"⚠️ Could not reload theme {self.theme_path}: {e}")
+            self.theme_error = str(e)
+        finally:
+            self.after(THEME_POLL_MS, self.watch_theme)
+    
+    def create_task_card(self, parent, task=None):
+        with METRICS.span("create_task_card"):
+            card = TaskCard(parent, self)
+            if task is not None:
+                card.show_task(task)
+        return card
     
     def show_loading(self):
         # Loading overlay
         self.loading_frame = ctk.CTkFrame(
             self,
-            fg_color=("gray95", "gray10"),
+            fg_color=self.style["loading"],
             corner_radius=0
         )
         self.loading_frame.place(x=0, y=0, relwidth=1, relheight=1)
@@ -309,90 +3691,511 @@ class ModernTodoApp(ctk.CTk):
             self.loading_frame,
             text="⚡ Loading Todo Python...",
             font=ctk.CTkFont(size=24, weight="bold"),
-            text_color=("#1e40af", "#3b82f6")
+            text_color=self.style["accent"]
         )
         self.loading_label.place(relx=0.5, rely=0.5, anchor="center")
         
-        # Progress bar
+        # Progress bar driven by the actual loading stages
         self.progress = ctk.CTkProgressBar(self.loading_frame, width=300)
         self.progress.place(relx=0.5, rely=0.6, anchor="center")
         self.progress.set(0)
         
-        # Animate loading
-        threading.Thread(target=self.animate_loading, daemon=True).start()
-    
-    def animate_loading(self):
-        for i in range(101):
-            self.progress.set(i / 100)
-            time.sleep(0.02)
+        self.loading_stage = ctk.CTkLabel(
+            self.loading_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=self.style["muted_text"]
+        )
+        self.loading_stage.place(relx=0.5, rely=0.65, anchor="center")
         
-        self.after(500, self.hide_loading)
+        # Widgets are only touched from the Tk thread, the loader posts to a queue
+        self.loading_queue = queue.Queue()
+        threading.Thread(target=self.load_in_background, daemon=True).start()
+        self.after(LOADING_POLL_MS, self.poll_loading)
+    
+    def load_in_background(self):
+        try:
+            self.loading_queue.put(("progress", 0.1, "Reading tasks..."))
+            seen = set()
+            archived = []
+            days = self.settings["archive_after_days"]
+            cutoff = time.time() - days * 86400 if days else None
+            counts = self.store.count_by_status()
+            if counts:
+                counts = {STATUS_CODES[name]: count for name, count in counts.items() if name in STATUSES}
+                if cutoff is not None:
+                    # Part of Done is about to move to the archive
+                    counts.pop(ARCHIVE_STATUS, None)
+                self.loading_queue.put(("counts", 0.1, counts))
+            with METRICS.span("load_tasks"):
+                for progress, entries in self.store.iter_batches():
+                    if cutoff is not None:
+                        archived.extend(entry[1] for entry in entries if archivable(entry[1], cutoff))
+                        entries = [entry for entry in entries if not archivable(entry[1], cutoff)]
+                    group = TaskRepository.group_entries(entries, seen)
+                    tokens = SearchIndex.tokenize_entries(entries, group)
+                    self.loading_queue.put(("batch", progress, (group, tokens)))
+            if archived:
+                with METRICS.span("archive_tasks"):
+                    store = open_store(self.store.path)
+                    try:
+                        archive_tasks(store, [task.to_dict() for task in archived])
+                    finally:
+                        store.close()
+            self.loading_queue.put(("done", 1, None))
+        except Exception as e:
+            self.loading_queue.put(("error", 1, e))
+    
+    def poll_loading(self):
+        while True:
+            try:
+                kind, progress, payload = self.loading_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "batch":
+                group, tokens = payload
+                statuses = self.repo.merge(group)
+                self.search_index.merge(tokens)
+                if any(self.views.values()):
+                    for task in group["tasks"]:
+                        self.refilter("add", task, None)
+                # Cheap once the viewport is full, only the visible rows are bound
+                self.refresh_columns(statuses, statuses)
+                # The first screen is ready, the rest keeps streaming in behind it
+                if self.loading_frame is not None:
+                    self.hide_loading()
+            elif kind == "counts":
+                self.store_counts = payload
+                self.refresh_columns(payload, ())
+            elif kind == "progress":
+                self.progress.set(progress)
+                self.loading_stage.configure(text=payload)
+            else:
+                if kind == "error":
+                    print(f"⚠️ Error while loading tasks: {payload}")
+                if self.loading_frame is not None:
+                    self.hide_loading()
+                if self.store_counts is not None:
+                    self.store_counts = None
+                    self.refresh_columns(self.columns, ())
+                self.start_watcher()
+                self.update_older_button()
+                self.after(DIALOG_PREWARM_MS, self.prewarm_dialogs)
+                if self.sync is not None and kind != "error":
+                    self.sync.start()
+                return
+        self.after(LOADING_POLL_MS, self.poll_loading)
+    
+    def persist(self, changes):
+        # Changes merged from disk are already there, archived tasks shown on
+        # the board only go back to it once the user changes them
+        if self.repo.origin in ("external", "archive"):
+            return
+        if self.archived_ids:
+            changes = self.restore_archived(changes)
+        persist_changes(self.writer, changes)
+    
+    def restore_archived(self, changes):
+        # An edited archived task is written to the board as a new one, the
+        # archive stops handing out its old copy
+        result = []
+        restored = []
+        for change in changes:
+            event, task = change[:2]
+            if task.id in self.archived_ids:
+                self.archived_ids.discard(task.id)
+                restored.append(task.id)
+                if event == "update":
+                    change = ("add", task, None, ())
+            result.append(change)
+        if restored:
+            self.archive.drop(restored)
+        return result
+    
+    def update_older_button(self):
+        segments = self.archive.segments()
+        remaining = sum(segment["count"] for segment in segments[self.archive_pages:])
+        if remaining:
+            self.older_btn.configure(text=f"📦 Load older ({remaining} archived)", state="normal")
+            self.older_btn.pack(side="bottom", fill="x", padx=10, pady=(0, 10), before=self.columns[ARCHIVE_STATUS]["list"])
+        else:
+            self.older_btn.pack_forget()
+    
+    def load_older(self):
+        segments = self.archive.segments()
+        if self.archive_loading or self.archive_pages >= len(segments):
+            return
+        self.archive_loading = True
+        self.older_btn.configure(text="📦 Loading...", state="disabled")
+        segment = segments[self.archive_pages]
+        self.archive_pages += 1
+        threading.Thread(target=self.read_archive, args=(self.archive.read, segment), daemon=True).start()
+    
+    def search_archive(self, terms):
+        self.read_archive(self.archive.search, terms, terms)
+    
+    def read_archive(self, read, argument, terms=None):
+        # Background thread, the tasks are added by poll_external. terms tags
+        # search hits with the query they answer, None is a "load older" page.
+        try:
+            records = read(argument)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Error while reading the archive: {e}")
+            records = []
+        self.external_queue.put(("archive", (terms, records)))
+    
+    def add_archived(self, terms, records):
+        # Shown in the Done column and searchable, not written to the board.
+        # Search hits only stay while their query does, a page stays.
+        if terms is not None and terms != self.search_terms:
+            return
+        with METRICS.span("load_archive"):
+            self.repo.origin = "archive"
+            try:
+                with self.repo.batch():
+                    for data in records:
+                        if data["id"] not in self.repo.by_id:
+                            self.archived_ids.add(data["id"])
+                            self.repo.add(Task.from_dict(data))
+                            if terms is not None:
+                                self.archive_hits.add(data["id"])
+                        elif terms is None:
+                            self.archive_hits.discard(data["id"])
+            finally:
+                self.repo.origin = None
+        if terms is None:
+            self.archive_loading = False
+            self.update_older_button()
+    
+    def drop_archive_hits(self):
+        # Hits of the previous query leave the board unless the user changed
+        # them since, which restored them
+        hits = [self.repo.by_id[task_id] for task_id in self.archive_hits if task_id in self.archived_ids and task_id in self.repo.by_id]
+        self.archive_hits = set()
+        if not hits:
+            return
+        self.repo.origin = "archive"
+        try:
+            with self.repo.batch():
+                for task in hits:
+                    self.archived_ids.discard(task.id)
+                    self.repo.delete(task)
+        finally:
+            self.repo.origin = None
+    
+    def start_watcher(self):
+        # Other windows and scripts sharing the board, see merge_external
+        self.watcher = ChangeWatcher(self.store.watched_paths(), self.read_external_changes)
+        self.watcher.start()
+        self.after(EXTERNAL_POLL_MS, self.poll_external)
+    
+    def sync_lookup(self, task_id):
+        # Sync thread: the Tk thread may be changing the board meanwhile
+        with self.repo.lock:
+            task = self.repo.get(task_id)
+            return task.to_dict() if task is not None else None
+    
+    def sync_ids(self):
+        with self.repo.lock:
+            return list(self.repo.by_id)
+    
+    def read_external_changes(self):
+        # Watcher thread: the disk is read here, the Tk thread only merges
+        try:
+            self.external_queue.put(self.store.read_changes())
+        except Exception as e:
+            print(f"⚠️ Error while reading external changes: {e}")
+    
+    def poll_external(self):
+        while True:
+            try:
+                kind, records = self.external_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "archive":
+                self.add_archived(*records)
+            elif records:
+                self.merge_external(kind, records)
+        self.after(EXTERNAL_POLL_MS, self.poll_external)
+    
+    def merge_external(self, kind, records):
+        # Merged by id and updated_at through the repository, so only the
+        # affected cards are redrawn and nothing is written back
+        with METRICS.span("merge_external"):
+            self.repo.origin = "external"
+            try:
+                if kind == "snapshot":
+                    present = set()
+                    for data in records:
+                        present.add(data["id"])
+                        self.merge_task(data)
+                    for task in [task for task in self.repo.by_id.values() if task.id not in present and task.id not in self.archived_ids]:
+                        if not self.writer.has_pending(task.id):
+                            self.repo.delete(task)
+                else:
+                    for record in records:
+                        self.merge_record(record)
+            finally:
+                self.repo.origin = None
+    
+    def merge_record(self, record):
+        op = record["op"]
+        if op == "create":
+            self.merge_task(record["task"])
+            return
+        task = self.repo.get(record["id"])
+        if task is None:
+            return
+        if op == "delete":
+            if not self.writer.has_pending(task.id):
+                self.repo.delete(task)
+        elif op == "move":
+            self.merge_fields(task, {"status": record["status"], "updated_at": record["updated_at"]})
+        else:
+            self.merge_fields(task, record["fields"])
+    
+    def merge_task(self, data):
+        task = self.repo.get(data["id"])
+        if task is None:
+            self.repo.add(Task.from_dict(data))
+        else:
+            self.merge_fields(task, {name: value for name, value in data.items() if name != "id"})
+    
+    def merge_fields(self, task, data):
+        # Older or equal updated_at is our own write coming back, or stale
+        updated_at = parse_timestamp(data.get("updated_at"))
+        if updated_at is not None and task.updated_at is not None and updated_at <= task.updated_at:
+            return
+        fields = {
+            name: value for name, value in Task.fields_from_dict(data).items()
+            if getattr(task, name) != value
+        }
+        if fields:
+            self.repo.update(task, **fields)
     
     def hide_loading(self):
         self.loading_frame.destroy()
+        self.loading_frame = None
+    
+    def dialog(self, cls):
+        # Each dialog is built once, at idle after loading or on first use
+        dialog = self.dialogs.get(cls)
+        if dialog is None or not dialog.winfo_exists():
+            dialog = self.dialogs[cls] = cls(self)
+        return dialog
+    
+    def prewarm_dialogs(self, classes=None):
+        # One dialog per idle round, the board stays responsive meanwhile
+        classes = list(classes or (EditTaskDialog, AddTaskDialog, SettingsDialog))
+        with METRICS.span("prewarm_dialog"):
+            self.dialog(classes.pop(0))
+        if classes:
+            self.after(DIALOG_PREWARM_MS, self.prewarm_dialogs, classes)
     
     def show_add_dialog(self):
-        AddTaskDialog(self)
+        with METRICS.span("add_dialog"):
+            self.dialog(AddTaskDialog).open()
     
     def show_settings(self):
-        SettingsDialog(self)
+        with METRICS.span("settings_dialog"):
+            self.dialog(SettingsDialog).open()
     
     def edit_task(self, task):
-        EditTaskDialog(self, task)
+        with METRICS.span("edit_dialog"):
+            self.dialog(EditTaskDialog).open(task)
+    
+    def column_rows(self, status):
+        # The rows the column shows right now, sorted or filtered
+        view = self.views.get(status)
+        return view.rows if view is not None else self.repo.rows(status)
+    
+    def column_position(self, status, task):
+        view = self.views.get(status)
+        if view is not None:
+            return view.position(task.id)
+        return bisect.bisect_left(self.repo.bucket(status)[0], self.repo.seq[task.id])
+    
+    def toggle_selected(self, task):
+        if task is None:
+            return
+        if task.id in self.selected:
+            self.selected.discard(task.id)
+        else:
+            self.selected.add(task.id)
+        self.select_anchor = task
+        self.selection_changed((task.status,))
+    
+    def select_range(self, task):
+        anchor = self.select_anchor
+        if task is None or anchor is None or anchor.status != task.status or anchor.id not in self.repo.by_id:
+            self.toggle_selected(task)
+            return
+        ends = [self.column_position(task.status, item) for item in (anchor, task)]
+        if None in ends:
+            self.toggle_selected(task)
+            return
+        ends.sort()
+        self.selected.update(item.id for item in self.column_rows(task.status)[ends[0]:ends[1] + 1])
+        self.selection_changed((task.status,))
+    
+    def select_column(self, status):
+        # Selects every card the column shows, a second click clears them
+        ids = {task.id for task in self.column_rows(status)}
+        if ids and ids <= self.selected:
+            self.selected -= ids
+        else:
+            self.selected |= ids
+        self.select_anchor = None
+        self.selection_changed((status,))
+    
+    def clear_selection(self, event=None):
+        statuses = {self.repo.by_id[task_id].status for task_id in self.selected if task_id in self.repo.by_id}
+        self.selected.clear()
+        self.select_anchor = None
+        self.selection_changed(statuses)
+    
+    def forget_deleted(self, changes):
+        # Repository listener: deleted tasks leave the selection
+        if not self.selected:
+            return
+        gone = {task.id for event, task, old_status, fields in changes if event == "delete"}
+        if not gone.isdisjoint(self.selected):
+            self.selected -= gone
+            self.selection_changed(())
+    
+    def selection_changed(self, statuses):
+        for status in statuses:
+            for card in self.columns[status]["list"].visible.values():
+                card.show_selected(card.task.id in self.selected)
+        if self.selected:
+            self.selection_label.configure(text=f"{len(self.selected)} selected")
+            self.batch_move_menu.set("Move to")
+            self.batch_priority_menu.set("Priority")
+            self.batch_bar.pack(side="left", padx=(20, 0))
+        else:
+            self.batch_bar.pack_forget()
+    
+    def selected_tasks(self):
+        return [self.repo.by_id[task_id] for task_id in self.selected if task_id in self.repo.by_id]
+    
+    def batch_move(self, status):
+        code = STATUS_CODES[status]
+        tasks = [task for task in self.selected_tasks() if task.status != code]
+        with METRICS.span("batch_update"), self.repo.batch():
+            self.repo.update_many(tasks, status=code, updated_at=time.time())
+        self.clear_selection()
+    
+    def batch_priority(self, priority):
+        code = PRIORITY_CODES[priority]
+        tasks = [task for task in self.selected_tasks() if task.priority != code]
+        with METRICS.span("batch_update"), self.repo.batch():
+            self.repo.update_many(tasks, priority=code, updated_at=time.time())
+        self.clear_selection()
+    
+    def batch_delete(self):
+        tasks = self.selected_tasks()
+        if tasks and tk.messagebox.askyesno("Delete Tasks", f"Delete {len(tasks)} selected tasks?"):
+            with METRICS.span("batch_delete"), self.repo.batch():
+                self.repo.delete_many(tasks)
+            self.clear_selection()
+    
+    def undo(self, event=None):
+        if self.editing_text(event):
+            return
+        with METRICS.span("undo"):
+            self.history.undo()
+    
+    def redo(self, event=None):
+        if self.editing_text(event):
+            return
+        with METRICS.span("redo"):
+            self.history.redo()
+    
+    @staticmethod
+    def editing_text(event):
+        # The shortcuts are bound on the window, typed into the search box or a
+        # text field they belong to the text and not to the board
+        return event is not None and isinstance(event.widget, (tk.Entry, tk.Text))
     
     def delete_task(self, task):
-        if tk.messagebox.askyesno("Delete Task", f"Delete '{task['title']}'?"):
-            self.tasks.remove(task)
-            self.save_tasks()
-            self.update_board()
+        if tk.messagebox.askyesno("Delete Task", f"Delete '{task.title}'?"):
+            self.repo.delete(task)
     
     def move_task(self, task, direction):
-        current_idx = STATUSES.index(task["status"])
-        new_idx = current_idx + direction
+        new_idx = task.status + direction
         
         if 0 <= new_idx < len(STATUSES):
-            task["status"] = STATUSES[new_idx]
-            task["updated_at"] = datetime.now().isoformat()
-            self.save_tasks()
-            self.update_board()
-    
-    def load_tasks(self):
-        if os.path.exists(DATA_FILE):
-            try:
-                with open(DATA_FILE, 'r') as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
+            self.repo.update(task, status=new_idx, updated_at=time.time())
     
-    def save_tasks(self):
-        with open(DATA_FILE, 'w') as f:
-            json.dump(self.tasks, f, indent=2)
+    def on_close(self):
+        # Pending writes must reach the disk before the window goes away
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self.sync is not None:
+            self.sync.stop()
+        self.writer.close()
+        self.destroy()
 
-class AddTaskDialog(ctk.CTkToplevel):
+class ReusableDialog(ctk.CTkToplevel):
+    # Built once and kept withdrawn, show() brings it back and closing only
+    # hides it. The position is recomputed only when the parent moved.
+    width = 450
+    height = 400
+    # Tall dialogs scroll, can be made taller and never open taller than the screen
+    scrolls = False
+    
     def __init__(self, parent):
         super().__init__(parent)
+        self.withdraw()
         self.parent = parent
-        self.title("➕ Add New Task")
-        self.geometry("450x400")
-        self.resizable(False, False)
+        if self.scrolls:
+            # geometry() takes unscaled sizes, the screen is in real pixels
+            screen = (self.winfo_screenheight() - DIALOG_SCREEN_MARGIN) / self._get_window_scaling()
+            self.height = min(self.height, int(screen))
+        self.geometry(f"{self.width}x{self.height}")
+        self.resizable(False, self.scrolls)
         self.transient(parent)
-        self.grab_set()
-        
-        # Center dialog
-        self.after(10, self.center_dialog)
-        
+        self.placed_for = None
+        self.protocol("WM_DELETE_WINDOW", self.close)
         self.setup_ui()
     
-    def center_dialog(self):
-        parent_x = self.parent.winfo_x()
-        parent_y = self.parent.winfo_y()
-        parent_width = self.parent.winfo_width()
-        parent_height = self.parent.winfo_height()
-        
-        x = parent_x + (parent_width - 450) // 2
-        y = parent_y + (parent_height - 400) // 2
-        self.geometry(f"450x400+{x}+{y}")
+    def show(self):
+        parent_geometry = (
+            self.parent.winfo_x(),
+            self.parent.winfo_y(),
+            self.parent.winfo_width(),
+            self.parent.winfo_height()
+        )
+        if parent_geometry != self.placed_for:
+            self.placed_for = parent_geometry
+            parent_x, parent_y, parent_width, parent_height = parent_geometry
+            x = parent_x + (parent_width - self.width) // 2
+            y = max(0, parent_y + (parent_height - self.height) // 2)
+            self.geometry(f"{self.width}x{self.height}+{x}+{y}")
+        self.deiconify()
+        self.lift()
+        try:
+            self.grab_set()
+        except tk.TclError:
+            # Not mapped yet on some window managers
+            self.after(10, self.grab_set)
+    
+    def close(self):
+        self.grab_release()
+        self.withdraw()
+
+class AddTaskDialog(ReusableDialog):
+    def open(self):
+        self.title("➕ Add New Task")
+        self.reset()
+        self.show()
+        self.title_entry.focus()
+    
+    def reset(self):
+        self.title_entry.delete(0, "end")
+        self.desc_text.delete("0.0", "end")
+        self.priority_var.set("Important")
+        self.status_var.set("Todo")
     
     def setup_ui(self):
         # Main container
@@ -433,15 +4236,9 @@ class AddTaskDialog(ctk.CTkToplevel):
         btn_frame = ctk.CTkFrame(main, fg_color="transparent")
         btn_frame.pack(fill="x", pady=(20, 0))
         
-        ctk.CTkButton(
-            btn_frame,
-            text="Cancel",
-            command=self.destroy,
-            fg_color=("gray75", "gray25"),
-            hover_color=("gray65", "gray35"),
-            height=40,
-            corner_radius=10
-        ).pack(side="right", padx=(10, 0))
+        cancel_btn = ctk.CTkButton(btn_frame, text="Cancel", command=self.close, height=40, corner_radius=10)
+        cancel_btn.pack(side="right", padx=(10, 0))
+        self.parent.add_styled(cancel_btn, fg_color="secondary", hover_color="secondary_hover")
         
         ctk.CTkButton(
             btn_frame,
@@ -451,88 +4248,91 @@ class AddTaskDialog(ctk.CTkToplevel):
             corner_radius=10,
             font=ctk.CTkFont(weight="bold")
         ).pack(side="right")
-        
-        self.title_entry.focus()
     
     def create_task(self):
         title = self.title_entry.get().strip()
         if not title:
             tk.messagebox.showerror("Error", "Title is required!")
             return
+        import uuid
         
-        task = {
-            "id": str(uuid.uuid4()),
-            "title": title,
-            "description": self.desc_text.get("0.0", "end").strip(),
-            "priority": self.priority_var.get(),
-            "status": self.status_var.get(),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
+        now = time.time()
+        task = Task(
+            str(uuid.uuid4()),
+            title,
+            self.desc_text.get("0.0", "end").strip(),
+            PRIORITY_CODES[self.priority_var.get()],
+            STATUS_CODES[self.status_var.get()],
+            now,
+            now
+        )
         
-        self.parent.tasks.append(task)
-        self.parent.save_tasks()
-        self.parent.update_board()
-        self.destroy()
+        self.parent.repo.add(task)
+        self.close()
 
 class EditTaskDialog(AddTaskDialog):
-    def __init__(self, parent, task):
+    task = None
+    
+    def open(self, task):
         self.task = task
-        super().__init__(parent)
-        self.title(f"✏️ Edit: {task['title']}")
+        self.title(f"✏️ Edit: {task.title}")
+        self.reset()
         self.populate_fields()
+        self.show()
+        self.title_entry.focus()
     
     def populate_fields(self):
-        self.title_entry.insert(0, self.task["title"])
-        self.desc_text.insert("0.0", self.task["description"])
-        self.priority_var.set(self.task["priority"])
-        self.status_var.set(self.task["status"])
+        self.title_entry.insert(0, self.task.title)
+        self.desc_text.insert("0.0", self.task.description)
+        self.priority_var.set(self.task.priority_name)
+        self.status_var.set(self.task.status_name)
     
     def create_task(self):
         title = self.title_entry.get().strip()
         if not title:
             tk.messagebox.showerror("Error", "Title is required!")
             return
+        # Deleted meanwhile, by another window or an undo
+        if self.parent.repo.get(self.task.id) is not self.task:
+            self.close()
+            return
         
-        self.task.update({
-            "title": title,
-            "description": self.desc_text.get("0.0", "end").strip(),
-            "priority": self.priority_var.get(),
-            "status": self.status_var.get(),
-            "updated_at": datetime.now().isoformat()
-        })
-        
-        self.parent.save_tasks()
-        self.parent.update_board()
-        self.destroy()
+        self.parent.repo.update(
+            self.task,
+            title=title,
+            description=self.desc_text.get("0.0", "end").strip(),
+            priority=PRIORITY_CODES[self.priority_var.get()],
+            status=STATUS_CODES[self.status_var.get()],
+            updated_at=time.time()
+        )
+        self.close()
 
-class SettingsDialog(ctk.CTkToplevel):
-    def __init__(self, parent):
-        super().__init__(parent)
-        self.parent = parent
+class SettingsDialog(ReusableDialog):
+    width = 420
+    height = 740
+    scrolls = True
+    
+    def open(self):
         self.title("⚙️ Settings")
-        self.geometry("400x300")
-        self.resizable(False, False)
-        self.transient(parent)
-        self.grab_set()
-        
-        # Center dialog
-        self.after(10, self.center_dialog)
-        self.setup_ui()
+        self.reset()
+        self.show()
     
-    def center_dialog(self):
-        parent_x = self.parent.winfo_x()
-        parent_y = self.parent.winfo_y()
-        parent_width = self.parent.winfo_width()
-        parent_height = self.parent.winfo_height()
-        
-        x = parent_x + (parent_width - 400) // 2
-        y = parent_y + (parent_height - 300) // 2
-        self.geometry(f"400x300+{x}+{y}")
+    def reset(self):
+        # Settings may have changed since the dialog was last shown
+        self.theme_var.set(ctk.get_appearance_mode())
+        self.themes = {"Default": None}
+        for theme in find_themes():
+            if theme["menu"]:
+                self.themes.setdefault(theme["name"], theme["path"])
+        self.color_theme_menu.configure(values=list(self.themes))
+        self.color_theme_var.set(next((name for name, path in self.themes.items() if path == self.parent.theme_path), "Default"))
+        self.update_var.set(self.parent.settings["check_for_updates"])
+        self.metrics_var.set(METRICS.enabled)
+        self.show_metrics()
     
     def setup_ui(self):
-        main = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
-        main.pack(fill="both", expand=True, padx=30, pady=30)
+        main = ctk.CTkScrollableFrame(self, corner_radius=0, fg_color="transparent")
+        main.pack(fill="both", expand=True, padx=(30, 15), pady=30)
         
         # Theme selection
         ctk.CTkLabel(main, text="🎨 Appearance", font=ctk.CTkFont(size=18, weight="bold")).pack(anchor="w", pady=(0, 15))
@@ -551,6 +4351,46 @@ class SettingsDialog(ctk.CTkToplevel):
         )
         theme_menu.pack(fill="x", padx=15, pady=(0, 15))
         
+        # .ctheme files next to the app or in the working directory
+        ctk.CTkLabel(theme_frame, text="Color Theme:", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=15, pady=(0, 5))
+        
+        self.themes = {"Default": None}
+        self.color_theme_var = ctk.StringVar(value="Default")
+        self.color_theme_menu = ctk.CTkOptionMenu(
+            theme_frame,
+            values=list(self.themes),
+            variable=self.color_theme_var,
+            command=self.change_color_theme
+        )
+        self.color_theme_menu.pack(fill="x", padx=15, pady=(0, 15))
+        
+        self.update_var = ctk.BooleanVar(value=self.parent.settings["check_for_updates"])
+        ctk.CTkSwitch(
+            main,
+            text="Check for updates at startup",
+            variable=self.update_var,
+            command=self.change_update_check
+        ).pack(anchor="w")
+        
+        # Performance section: timings of the hot paths since startup
+        ctk.CTkLabel(main, text="📊 Performance", font=ctk.CTkFont(size=18, weight="bold")).pack(anchor="w", pady=(20, 15))
+        
+        self.metrics_var = ctk.BooleanVar(value=METRICS.enabled)
+        ctk.CTkSwitch(
+            main,
+            text="Collect timings",
+            variable=self.metrics_var,
+            command=self.change_metrics
+        ).pack(anchor="w")
+        
+        self.metrics_box = ctk.CTkTextbox(main, height=140, font=ctk.CTkFont(family="Courier", size=11), wrap="none")
+        self.metrics_box.pack(fill="x", pady=10)
+        
+        metrics_buttons = ctk.CTkFrame(main, fg_color="transparent")
+        metrics_buttons.pack(fill="x")
+        ctk.CTkButton(metrics_buttons, text="🔄 Refresh", width=120, command=self.show_metrics).pack(side="left")
+        ctk.CTkButton(metrics_buttons, text="💾 Export JSON", width=120, command=self.export_metrics).pack(side="right")
+        
         # About section
         ctk.CTkLabel(main, text="ℹ️ About", font=ctk.CTkFont(size=18, weight="bold")).pack(anchor="w", pady=(20, 15))
         
@@ -566,6 +4406,45 @@ class SettingsDialog(ctk.CTkToplevel):
     
     def change_theme(self, theme):
         ctk.set_appearance_mode(theme)
+    
+    def change_color_theme(self, name):
+        self.parent.set_theme(self.themes[name])
+        self.parent.settings["theme"] = self.parent.theme_path
+        save_settings(self.parent.settings)
+    
+    def change_update_check(self):
+        self.parent.settings["check_for_updates"] = self.update_var.get()
+        save_settings(self.parent.settings)
+    
+    def change_metrics(self):
+        METRICS.enabled = self.metrics_var.get()
+        self.parent.settings["collect_metrics"] = METRICS.enabled
+        save_settings(self.parent.settings)
+    
+    def show_metrics(self):
+        lines = [f"{'span':<17}{'count':>6}{'p50':>8}{'p95':>8}{'max':>8}"]
+        for name, stats in METRICS.summary().items():
+            lines.append(
+                f"{name:<17}{stats['count']:>6}{stats['p50_ms']:>8.1f}{stats['p95_ms']:>8.1f}{stats['max_ms']:>8.1f}"
+            )
+        if len(lines) == 1:
+            lines.append("No timings yet")
+        self.metrics_box.configure(state="normal")
+        self.metrics_box.delete("1.0", "end")
+        self.metrics_box.insert("1.0", "\n".join(lines) + "\n(milliseconds)")
+        self.metrics_box.configure(state="disabled")
+    
+    def export_metrics(self):
+        import tkinter.filedialog
+
+        path = tk.filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=".json",
+            initialfile=METRICS_FILE,
+            filetypes=[("JSON", "*.json")]
+        )
+        if path:
+            METRICS.export(path)
 
 if __name__ == "__main__":
     app = ModernTodoApp()
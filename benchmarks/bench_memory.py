@@ -0,0 +1,70 @@
+# Memory used per task: the plain dicts json.load produces versus Task objects.
+#
+#   python benchmarks/bench_memory.py [count]
+import gc
+import importlib.util
+import json
+import os
+import random
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Todo Python.py")
+
+def load_app():
+    spec = importlib.util.spec_from_file_location("todo_python", APP_FILE)
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+def make_tasks_json(app, count):
+    start = datetime(2024, 1, 1)
+    tasks = []
+    for i in range(count):
+        created = start + timedelta(minutes=i)
+        tasks.append({
+            "id": str(uuid.uuid4()),
+            "title": f"Task number {i}",
+            "description": "" if i % 3 else "Some details about this task",
+            "priority": random.choice(app.PRIORITIES),
+            "status": random.choice(app.STATUSES),
+            "created_at": created.isoformat(),
+            "updated_at": (created + timedelta(hours=1)).isoformat()
+        })
+    return json.dumps(tasks)
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, used
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    app = load_app()
+    text = make_tasks_json(app, count)
+
+    dicts, dict_bytes = measure(lambda: json.loads(text))
+    # Parse again so the Task side pays for its own id and title strings
+    tasks, task_bytes = measure(lambda: [app.Task.from_dict(task) for task in json.loads(text)])
+    assert [task.to_dict() for task in tasks[:100]] == dicts[:100]
+
+    # id, title and description strings are the same size in both layouts
+    payload = sum(
+        sys.getsizeof(task["id"]) + sys.getsizeof(task["title"])
+        + (sys.getsizeof(task["description"]) if task["description"] else 0)
+        for task in dicts
+    )
+
+    print(f"{count} tasks                total   overhead (bytes/task)")
+    print(f"  dict:             {dict_bytes / count:8.1f}   {(dict_bytes - payload) / count:8.1f}")
+    print(f"  Task:             {task_bytes / count:8.1f}   {(task_bytes - payload) / count:8.1f}")
+    print(f"  ratio:            {dict_bytes / task_bytes:7.1f}x  {(dict_bytes - payload) / (task_bytes - payload):7.1f}x")
+
+if __name__ == "__main__":
+    main()
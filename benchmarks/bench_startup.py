@@ -0,0 +1,159 @@
+# Startup cost of the app: wall-clock time to import Todo Python.py, and with
+# a display the time from launching the process to the first mainloop
+# iteration. One extra run under python -X importtime lists the modules that
+# cost the most. Exits with 1 when a median goes over its budget or when a
+# module that should load on first use is imported at startup.
+#
+#   python benchmarks/bench_startup.py [--repeat 5] [--tasks 1000] [--output startup.json]
+#   python benchmarks/bench_startup.py --import-budget-ms 250 --mainloop-budget-ms 1500
+#
+# Without a display the mainloop timing re-runs under xvfb-run when it is
+# installed, otherwise it is skipped.
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from bench_suite import APP_FILE, XVFB_MARKER, generate_tasks, has_display
+
+# Only commands, dialogs or sync use these, starting the window must not import them
+LAZY_MODULES = ("argparse", "ast", "csv", "gzip", "hashlib", "http.server", "sqlite3", "urllib.request", "uuid")
+
+# Runs in a fresh interpreter: argv is the app file and "import" or "mainloop"
+CHILD = """
+import time
+launched = time.time()
+import importlib.util, json, sys
+spec = importlib.util.spec_from_file_location("todo_python", sys.argv[1])
+app = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(app)
+result = {"started": launched, "imported": time.time(), "modules": sorted(sys.modules)}
+if sys.argv[2] == "mainloop":
+    window = app.ModernTodoApp()
+    def first_iteration():
+        result["mainloop"] = time.time()
+        window.on_close()
+    window.after(0, first_iteration)
+    window.mainloop()
+print(json.dumps(result))
+"""
+
+def run_child(mode, importtime=False):
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", CHILD, APP_FILE, mode]
+    launched = time.time()
+    done = subprocess.run(command, capture_output=True, text=True, check=True)
+    result = json.loads(done.stdout.strip().splitlines()[-1])
+    result["launched"] = launched
+    result["stderr"] = done.stderr
+    return result
+
+def parse_importtime(text):
+    # "import time: self | cumulative | name", top-level imports are not indented
+    modules = {}
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        cumulative, name = line.split("|")[1:3]
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue
+        modules[name.strip()] = int(cumulative) / 1000
+    return modules
+
+def summary(samples):
+    return {"median": statistics.median(samples), "min": min(samples), "runs": len(samples)}
+
+def run_startup(args, gui):
+    workdir = tempfile.mkdtemp(prefix="todo-startup-")
+    os.chdir(workdir)
+    # The app reads its board and settings from the working directory, the
+    # generated tasks are old enough to be archived
+    with open("settings.json", "w", encoding="utf-8") as f:
+        json.dump({"check_for_updates": False, "archive_after_days": None}, f)
+    data_file = os.path.join(workdir, "tasks.json")
+    os.environ["TODO_PYTHON_DATA"] = data_file
+    os.environ.pop("TODO_PYTHON_SYNC", None)
+    statuses, priorities = ["Todo", "InProgress", "Done"], ["Low", "Important", "Urgent"]
+    with open(data_file, "w", encoding="utf-8") as f:
+        json.dump(generate_tasks(args.tasks, statuses, [1] * 3, priorities, [1] * 3, (0, 200)), f)
+
+    results = {}
+    try:
+        runs = [run_child("import") for _ in range(args.repeat)]
+        results["import"] = summary([run["imported"] - run["started"] for run in runs])
+        results["launch_to_import"] = summary([run["imported"] - run["launched"] for run in runs])
+        eager = sorted(set(LAZY_MODULES).intersection(runs[0]["modules"]))
+
+        profile = parse_importtime(run_child("import", importtime=True)["stderr"])
+        top = dict(sorted(profile.items(), key=lambda item: item[1], reverse=True)[:args.top])
+
+        if gui:
+            runs = [run_child("mainloop") for _ in range(args.repeat)]
+            results["launch_to_mainloop"] = summary([run["mainloop"] - run["launched"] for run in runs])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results, top, eager
+
+def main():
+    parser = argparse.ArgumentParser(description="Todo Python startup benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks on the board the window opens")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    parser.add_argument("--import-budget-ms", type=float, default=250)
+    parser.add_argument("--mainloop-budget-ms", type=float, default=1500)
+    parser.add_argument("--no-gui", action="store_true", help="only time the import")
+    parser.add_argument("--output", default="startup_results.json")
+    args = parser.parse_args()
+
+    if not args.no_gui and not has_display() and shutil.which("xvfb-run") and not os.environ.get(XVFB_MARKER):
+        env = dict(os.environ, **{XVFB_MARKER: "1"})
+        sys.exit(subprocess.call(["xvfb-run", "-a", sys.executable, *sys.argv], env=env))
+
+    output = os.path.abspath(args.output)
+    gui = not args.no_gui and has_display()
+    if not args.no_gui and not gui:
+        print("⚠️ No display and no xvfb-run, the mainloop timing is skipped", file=sys.stderr)
+
+    results, top, eager = run_startup(args, gui)
+    budgets = {"import": args.import_budget_ms, "launch_to_mainloop": args.mainloop_budget_ms}
+    over = []
+    for name, timing in results.items():
+        budget = budgets.get(name)
+        flag = ""
+        if budget is not None and timing["median"] * 1000 > budget:
+            flag = f"  ⚠️ over the {budget:.0f} ms budget"
+            over.append(name)
+        print(f"{name:20} {timing['median'] * 1000:10.2f} ms  (min {timing['min'] * 1000:.2f} ms){flag}")
+    print("slowest top-level imports:")
+    for name, ms in top.items():
+        print(f"  {name:30} {ms:8.2f} ms")
+    if eager:
+        print(f"⚠️ imported at startup instead of on first use: {', '.join(eager)}")
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "tasks": args.tasks,
+                "gui": gui
+            },
+            "budgets_ms": budgets,
+            "results": results,
+            "imports_ms": top,
+            "eager_modules": eager
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+    if over or eager:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
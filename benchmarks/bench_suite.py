@@ -0,0 +1,263 @@
+# Timings for the main paths of the app at several board sizes: load, save,
+# first streamed batch, the same for a binary snapshot, and with a display
+# update_board, create_task_card, move_task and delete_task. Results are
+# written as JSON and can be compared against a stored baseline.
+#
+#   python benchmarks/bench_suite.py [--counts 1000,10000,100000] [--output results.json]
+#   python benchmarks/bench_suite.py --baseline baseline.json [--threshold 0.1]
+#
+# Without a display the GUI benchmarks re-run the suite under xvfb-run when it
+# is installed, otherwise they are skipped.
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Todo Python.py")
+XVFB_MARKER = "TODO_PYTHON_BENCH_XVFB"
+
+def load_app():
+    spec = importlib.util.spec_from_file_location("todo_python", APP_FILE)
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+def parse_weights(text, names):
+    # "Todo=2,Done=1" -> weights in the order of names, missing names weigh 0
+    if not text:
+        return [1] * len(names)
+    weights = dict.fromkeys(names, 0)
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in weights:
+            raise SystemExit(f"unknown name {name!r}, expected one of {', '.join(names)}")
+        weights[name] = float(weight or 1)
+    return list(weights.values())
+
+def generate_tasks(count, statuses, status_weights, priorities, priority_weights, description_lengths, seed=0):
+    # Same JSON form the app writes, reproducible for a given seed
+    rng = random.Random(seed)
+    words = ["review", "deploy", "fix", "write", "test", "plan", "call", "update", "report", "design"]
+    start = datetime(2024, 1, 1)
+    shortest, longest = description_lengths
+    tasks = []
+    for i in range(count):
+        created = start + timedelta(minutes=i)
+        length = rng.randint(shortest, longest)
+        description = " ".join(rng.choice(words) for _ in range(length // 6 + 1))[:length]
+        tasks.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "title": f"{rng.choice(words).capitalize()} task {i}",
+            "description": description,
+            "priority": rng.choices(priorities, priority_weights)[0],
+            "status": rng.choices(statuses, status_weights)[0],
+            "created_at": created.isoformat(),
+            "updated_at": (created + timedelta(hours=1)).isoformat()
+        })
+    return tasks
+
+def timed(run, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        run(state)
+        samples.append(time.perf_counter() - start)
+    return {"median": statistics.median(samples), "min": min(samples), "runs": repeat}
+
+def core_benchmarks(app, path, repeat):
+    # Same store calls as the window's loader and PersistenceWorker, without a window
+    results = {}
+    store = app.JournalStore(path)
+    results["load_tasks"] = timed(lambda state: store.load(), repeat)
+    results["first_batch"] = timed(lambda state: next(iter(store.iter_batches())), repeat)
+
+    repo = app.TaskRepository()
+    seen = set()
+    for progress, entries in store.iter_batches():
+        repo.merge(repo.group_entries(entries, seen))
+    writer = app.PersistenceWorker(app.JournalStore(path + ".save.json"))
+
+    def save(state):
+        writer.save_snapshot(repo.tasks())
+        writer.flush()
+
+    results["save_tasks"] = timed(save, repeat)
+    writer.close()
+
+    # Same board as a binary snapshot, read through mmap
+    binary = app.BinaryStore(path + ".tpb")
+    tasks = [task.to_dict() for task in repo.tasks()]
+    results["save_binary"] = timed(lambda state: binary.write_snapshot(tasks), repeat)
+    results["first_batch_binary"] = timed(lambda state: next(iter(app.BinaryStore(binary.path).iter_batches())), repeat)
+    results["load_binary"] = timed(lambda state: sum(1 for _ in app.BinaryStore(binary.path).iter_batches()), repeat)
+    results["count_binary"] = timed(lambda state: app.BinaryStore(binary.path).count_by_status(), repeat)
+    return results
+
+def has_display():
+    return sys.platform != "linux" or bool(os.environ.get("DISPLAY"))
+
+def gui_benchmarks(app, count, repeat):
+    import tkinter.messagebox
+    tkinter.messagebox.askyesno = lambda *args, **kwargs: True
+
+    window = app.ModernTodoApp()
+    try:
+        # Let the background loader stream the whole board in
+        deadline = time.time() + 600
+        while len(window.repo) < count and time.time() < deadline:
+            window.update()
+        window.update()
+        results = {}
+
+        def update_board(state):
+            window.update_board()
+            window.update_idletasks()
+
+        results["update_board"] = timed(update_board, repeat)
+
+        task_list = window.columns[0]["list"]
+        task = window.repo.rows(0)[0]
+
+        cards = []
+
+        def create_card(state):
+            cards.append(window.create_task_card(task_list.viewport, task))
+            window.update_idletasks()
+
+        results["create_task_card"] = timed(create_card, repeat)
+        for card in cards:
+            card.destroy()
+
+        def move(state):
+            window.move_task(state, 1)
+            window.update_idletasks()
+
+        results["move_task"] = timed(move, repeat, setup=lambda: window.repo.rows(0)[0])
+
+        def delete(state):
+            window.delete_task(state)
+            window.update_idletasks()
+
+        results["delete_task"] = timed(delete, repeat, setup=lambda: window.repo.rows(0)[0])
+        window.writer.flush()
+        return results
+    finally:
+        window.on_close()
+
+def run_suite(args):
+    status_weights = parse_weights(args.status_weights, ["Todo", "InProgress", "Done"])
+    priority_weights = parse_weights(args.priority_weights, ["Low", "Important", "Urgent"])
+    shortest, _, longest = args.description_length.partition(":")
+    lengths = (int(shortest), int(longest or shortest))
+    gui = not args.no_gui and has_display()
+    if not args.no_gui and not gui:
+        print("⚠️ No display and no xvfb-run, GUI benchmarks are skipped", file=sys.stderr)
+
+    workdir = tempfile.mkdtemp(prefix="todo-bench-")
+    os.chdir(workdir)
+    # The app reads its board and settings from the working directory. The
+    # generated tasks are dated 2024, archiving would take the Done ones away.
+    with open("settings.json", "w", encoding="utf-8") as f:
+        json.dump({"check_for_updates": False, "archive_after_days": None}, f)
+    os.environ["TODO_PYTHON_DATA"] = os.path.join(workdir, "tasks.json")
+    app = load_app()
+
+    results = {}
+    for count in args.counts:
+        tasks = generate_tasks(
+            count, app.STATUSES, status_weights, app.PRIORITIES, priority_weights, lengths, args.seed
+        )
+        for name in os.listdir(workdir):
+            if name.startswith("tasks.json"):
+                path = os.path.join(workdir, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+        with open(app.DATA_FILE, "w", encoding="utf-8") as f:
+            json.dump(tasks, f, indent=2)
+
+        repeat = args.repeat if count < 100_000 else max(1, args.repeat // 2)
+        timings = core_benchmarks(app, app.DATA_FILE, repeat)
+        if gui:
+            timings.update(gui_benchmarks(app, count, repeat))
+        for name, timing in timings.items():
+            results[f"{name}@{count}"] = timing
+            print(f"{name + '@' + str(count):28} {timing['median'] * 1000:10.2f} ms  (min {timing['min'] * 1000:.2f} ms)")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "seed": args.seed,
+            "gui": gui
+        },
+        "results": results
+    }
+
+def compare(results, baseline, threshold):
+    # A benchmark regresses when its median is more than threshold slower
+    regressions = []
+    print(f"{'benchmark':28} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, timing in results["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        change = timing["median"] / old["median"] - 1 if old["median"] else 0
+        flag = ""
+        if change > threshold:
+            flag = "  ⚠️ regression"
+            regressions.append(name)
+        print(f"{name:28} {old['median'] * 1000:8.2f}ms {timing['median'] * 1000:8.2f}ms {change:+7.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Todo Python benchmark suite")
+    parser.add_argument("--counts", default="1000,10000,100000", type=lambda text: [int(n) for n in text.split(",")])
+    parser.add_argument("--status-weights", help="e.g. Todo=2,InProgress=1,Done=5")
+    parser.add_argument("--priority-weights", help="e.g. Low=3,Important=2,Urgent=1")
+    parser.add_argument("--description-length", default="0:200", help="MIN:MAX characters")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-gui", action="store_true", help="only the benchmarks that need no display")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, 0.10 is 10%%")
+    args = parser.parse_args()
+
+    if not args.no_gui and not has_display() and shutil.which("xvfb-run") and not os.environ.get(XVFB_MARKER):
+        env = dict(os.environ, **{XVFB_MARKER: "1"})
+        sys.exit(subprocess.call(["xvfb-run", "-a", sys.executable, *sys.argv], env=env))
+
+    output = os.path.abspath(args.output)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = run_suite(args)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import importlib.util
+import os
+
+import pytest
+
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Todo Python.py")
+
+@pytest.fixture(scope="session")
+def app():
+    # The app is a single script with a space in its name, load it by path
+    spec = importlib.util.spec_from_file_location("todo_python", APP_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def board(tmp_path, monkeypatch):
+    # Stores resolve tasks.json and settings.json against the working directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def make_task(task_id, title="Task", description="", status="Todo", priority="Low", updated_at="2024-01-01T10:00:00"):
+    return {
+        "id": task_id,
+        "title": title,
+        "description": description,
+        "priority": priority,
+        "status": status,
+        "created_at": "2024-01-01T09:00:00",
+        "updated_at": updated_at
+    }
@@ -0,0 +1,36 @@
+from conftest import make_task
+
+def archived(day, task_id, title="Task"):
+    return make_task(task_id, title=title, status="Done", updated_at=f"2024-01-{day:02d}T10:00:00")
+
+def test_segments_roll_over_and_page_newest_first(app, board, monkeypatch):
+    monkeypatch.setattr(app, "ARCHIVE_SEGMENT_TASKS", 2)
+    archive = app.TaskArchive(str(board / "tasks.json"))
+    archive.add([archived(1, "a"), archived(2, "b"), archived(3, "c")])
+    archive.add([archived(9, "d")])
+
+    segments = archive.segments()
+    assert [segment["count"] for segment in segments] == [1, 1, 2]
+    assert archive.count() == 4
+    assert [[data["id"] for data in archive.read(segment)] for segment in segments] == [["d"], ["c"], ["a", "b"]]
+    # Another process sees the same index
+    assert app.TaskArchive(str(board / "tasks.json")).count() == 4
+
+def test_search_matches_word_prefixes(app, board):
+    archive = app.TaskArchive(str(board / "tasks.json"))
+    archive.add([archived(1, "a", "Quarterly report"), archived(2, "b", "Report bug"), archived(3, "c", "Groceries")])
+    assert sorted(data["id"] for data in archive.search(("rep",))) == ["a", "b"]
+    assert [data["id"] for data in archive.search(("rep", "quart"))] == ["a"]
+    assert archive.search(("port",)) == []
+    assert len(archive.search(("rep",), limit=1)) == 1
+
+def test_restored_tasks_are_not_handed_out_again(app, board):
+    store = app.JournalStore(str(board / "tasks.json"))
+    store.write_snapshot([archived(1, "a", "Old report"), archived(2, "b"), make_task("c")])
+    assert app.cli_archive(store, 30) == 2
+    assert [task["id"] for task in store.load_records()] == ["c"]
+
+    archive = app.TaskArchive(store.path)
+    archive.drop(["a"])
+    assert archive.search(("old",)) == []
+    assert [data["id"] for data in app.TaskArchive(store.path).read(archive.segments()[0])] == ["b"]
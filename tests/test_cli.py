@@ -0,0 +1,55 @@
+import csv
+import json
+
+import pytest
+
+from conftest import make_task
+
+def test_import_skips_rows_the_board_cannot_show(app, board, capsys):
+    (board / "rows.csv").write_text("title,priority,status\nGood,Urgent,Done\nOdd,Weird,Todo\nLost,Low,Later\n", encoding="utf-8")
+    assert app.cli_main(["--data", "tasks.json", "import", "rows.csv"]) == 1
+
+    err = capsys.readouterr().err
+    assert "Row 2 skipped: unknown priority 'Weird'" in err
+    assert "Row 3 skipped: unknown status 'Later'" in err
+    tasks = app.JournalStore("tasks.json").load_records()
+    assert [(task["title"], task["priority"], task["status"]) for task in tasks] == [("Good", "Urgent", "Done")]
+
+def run(app, *argv):
+    return app.cli_main(["--data", "tasks.json", *argv])
+
+def test_import_export_move_and_delete(app, board, capsys):
+    rows = [make_task("a", priority="Urgent"), make_task("b"), make_task("c", status="Done")]
+    (board / "in.jsonl").write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    assert run(app, "import", "in.jsonl") == 0
+    assert run(app, "move", "--priority", "Urgent", "--to", "InProgress") == 0
+    assert run(app, "delete", "--status", "Done") == 0
+    assert "✅ 1 tasks deleted" in capsys.readouterr().err
+
+    assert run(app, "export", "out.csv") == 0
+    with open(board / "out.csv", encoding="utf-8", newline="") as f:
+        exported = list(csv.DictReader(f))
+    assert [(row["id"], row["status"]) for row in exported] == [("a", "InProgress"), ("b", "Todo")]
+
+    # The export reads back into an empty board as it was
+    assert app.cli_main(["--data", "copy.json", "import", "out.csv"]) == 0
+    assert app.JournalStore("copy.json").load_records() == app.JournalStore("tasks.json").load_records()
+
+def test_export_filters_and_json_format(app, board):
+    app.JournalStore("tasks.json").write_snapshot([make_task("a"), make_task("b", status="Done")])
+    assert run(app, "export", "done.json", "--status", "Done") == 0
+    assert [task["id"] for task in json.loads((board / "done.json").read_text(encoding="utf-8"))] == ["b"]
+
+def test_exit_codes(app, board, capsys):
+    # Usage errors exit through argparse with 2, failed commands return 1
+    with pytest.raises(SystemExit) as exit:
+        run(app, "delete")
+    assert exit.value.code == 2
+    with pytest.raises(SystemExit) as exit:
+        run(app, "move", "--to", "Nowhere")
+    assert exit.value.code == 2
+    assert run(app, "import", "missing.jsonl") == 1
+    assert "import failed" in capsys.readouterr().err
+    (board / "bad.json").write_text("{}", encoding="utf-8")
+    assert run(app, "import", "bad.json") == 1
+    assert run(app, "delete", "--all") == 0
@@ -0,0 +1,39 @@
+from conftest import make_task
+
+def tasks(app, *specs):
+    # (id, priority, title) in board order, seqs follow that order
+    made = [app.Task.from_dict(make_task(task_id, title=title, priority=priority)) for task_id, priority, title in specs]
+    return made, {task.id: seq for seq, task in enumerate(made)}
+
+def test_priority_sort_keeps_board_order_within_a_priority(app):
+    rows, seq_of = tasks(app, ("a", "Low", "x"), ("b", "Urgent", "x"), ("c", "Low", "x"), ("d", "Urgent", "x"), ("e", "Important", "x"))
+    view = app.ColumnView(seq_of, "Priority")
+    view.build([seq_of[task.id] for task in rows], rows)
+    assert [task.id for task in view.rows] == ["b", "d", "e", "a", "c"]
+
+    # Inserted and edited rows land where a full sort would put them
+    new = app.Task.from_dict(make_task("f", priority="Important"))
+    seq_of["f"] = 5
+    view.place(new, 5)
+    rows[0].priority = app.PRIORITY_CODES["Urgent"]
+    view.place(rows[0], seq_of["a"])
+    assert [task.id for task in view.rows] == ["a", "b", "d", "e", "f", "c"]
+    view.discard("d")
+    assert [task.id for task in view.rows] == ["a", "b", "e", "f", "c"]
+
+def test_title_sort_and_filters(app):
+    rows, seq_of = tasks(app, ("a", "Low", "beta"), ("b", "Urgent", "Alpha"), ("c", "Low", "alpha"), ("d", "Important", "gamma"))
+    view = app.ColumnView(seq_of, "Title", priorities={app.PRIORITY_CODES["Low"], app.PRIORITY_CODES["Urgent"]})
+    view.build([seq_of[task.id] for task in rows], rows)
+    assert [task.id for task in view.rows] == ["b", "c", "a"]
+    # A row the filter rejects is not placed
+    view.place(rows[3], seq_of["d"])
+    assert [task.id for task in view.rows] == ["b", "c", "a"]
+
+def test_search_mask_in_manual_order(app):
+    rows, seq_of = tasks(app, ("a", "Low", "x"), ("b", "Low", "x"), ("c", "Low", "x"))
+    view = app.ColumnView(seq_of, matches=lambda task_id: task_id != "b")
+    view.build([0, 1, 2], rows, [True, False, True])
+    assert [task.id for task in view.rows] == ["a", "c"]
+    view.place(rows[1], 1)
+    assert [task.id for task in view.rows] == ["a", "c"]
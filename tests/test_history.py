@@ -0,0 +1,43 @@
+import pytest
+
+from conftest import make_task
+
+@pytest.fixture
+def repo(app):
+    repo = app.TaskRepository()
+    repo.merge(app.TaskRepository.group_entries(
+        [(seq, app.Task.from_dict(make_task(f"id{seq}")), None) for seq in range(200)], set()
+    ))
+    return repo
+
+def ids(app, repo, status):
+    return [task.id for task in repo.rows(app.STATUS_CODES[status])]
+
+@pytest.mark.parametrize("count", [1, 80])
+def test_undo_redo_move_and_delete(app, repo, count):
+    history = app.History(repo)
+    repo.listeners.append(history.record)
+    todo = ids(app, repo, "Todo")
+    moved = repo.rows(app.STATUS_CODES["Todo"])[10:10 + count]
+    with repo.batch():
+        for task in moved:
+            repo.update(task, status=app.STATUS_CODES["Done"])
+    with repo.batch():
+        for task in list(repo.rows(app.STATUS_CODES["Todo"])[:count]):
+            repo.delete(task)
+
+    assert history.undo() and history.undo()
+    assert ids(app, repo, "Todo") == todo
+    assert ids(app, repo, "Done") == []
+    assert history.redo() and history.redo()
+    assert ids(app, repo, "Done") == [task.id for task in moved]
+    assert len(ids(app, repo, "Todo")) == 200 - 2 * count
+
+def test_single_undo_does_not_rebuild_buckets(app, repo, monkeypatch):
+    history = app.History(repo)
+    repo.listeners.append(history.record)
+    repo.update(repo.rows(0)[5], status=app.STATUS_CODES["Done"])
+    repo.delete(repo.rows(0)[7])
+    for name in ("update_many", "delete_many", "add_many"):
+        monkeypatch.setattr(repo, name, None)
+    assert history.undo() and history.undo() and history.redo() and history.redo()
@@ -0,0 +1,56 @@
+import time
+
+class RecordingStore:
+    def __init__(self):
+        self.writes = []
+        self.closed = False
+
+    def apply(self, changes):
+        self.writes.append(list(changes))
+
+    def write_snapshot(self, tasks):
+        self.writes.append(("snapshot", tasks))
+
+    def close(self):
+        self.closed = True
+
+def test_burst_of_updates_is_one_write(app):
+    store = RecordingStore()
+    writer = app.PersistenceWorker(store, debounce=0.3)
+    task = app.Task("a", "Draft")
+    writer.create(task)
+    for number in range(100):
+        task.title = f"Draft {number}"
+        writer.update(task, "title")
+    deadline = time.monotonic() + 5
+    while not store.writes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    writer.close()
+
+    assert len(store.writes) == 1
+    [(op, task_id, fields)] = store.writes[0]
+    assert (op, task_id, fields["title"]) == ("create", "a", "Draft 99")
+
+def test_close_flushes_without_waiting_for_the_debounce(app):
+    store = RecordingStore()
+    writer = app.PersistenceWorker(store, debounce=30)
+    task = app.Task("a", "Draft")
+    writer.create(task)
+    writer.update(task, "title")
+    writer.delete("gone")
+    started = time.monotonic()
+    writer.close()
+
+    assert time.monotonic() - started < 5
+    assert store.writes == [[("create", "a", task.to_dict()), ("delete", "gone", None)]]
+    assert store.closed
+
+def test_created_then_deleted_task_is_never_written(app):
+    store = RecordingStore()
+    writer = app.PersistenceWorker(store, debounce=30)
+    task = app.Task("a", "Draft")
+    writer.create(task)
+    writer.update(task, "title")
+    writer.delete("a")
+    writer.close()
+    assert store.writes == []
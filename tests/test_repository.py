@@ -0,0 +1,39 @@
+import threading
+
+from conftest import make_task
+
+def loaded(app, entries):
+    return app.TaskRepository.group_entries([(seq, app.Task.from_dict(data), None) for seq, data in entries], set())
+
+def test_task_added_while_loading_keeps_its_own_place(app):
+    repo = app.TaskRepository(app.RUNTIME_SEQ_START)
+    repo.merge(loaded(app, [(0, make_task("id0")), (1, make_task("id1"))]))
+    new = app.Task("new", "Added during load")
+    repo.add(new)
+    # The next batch reuses the seqs right after the first one
+    repo.merge(loaded(app, [(2, make_task("id2")), (3, make_task("id3"))]))
+
+    repo.update(new, status=app.STATUS_CODES["InProgress"])
+    assert [task.id for task in repo.rows(app.STATUS_CODES["Todo"])] == ["id0", "id1", "id2", "id3"]
+    assert [task.id for task in repo.rows(app.STATUS_CODES["InProgress"])] == ["new"]
+    assert [task.id for task in repo.tasks()] == ["id0", "id1", "id2", "id3", "new"]
+
+def test_changes_wait_for_a_reader_holding_the_lock(app):
+    # The sync thread reads tasks under repo.lock while the Tk thread edits them
+    repo = app.TaskRepository()
+    task = app.Task("a", "Draft")
+    repo.add(task)
+    changed = threading.Event()
+
+    def edit():
+        repo.update(task, title="Final")
+        repo.delete(task)
+        changed.set()
+
+    with repo.lock:
+        writer = threading.Thread(target=edit)
+        writer.start()
+        assert not changed.wait(0.05)
+        assert task.title == "Draft" and list(repo.by_id) == ["a"]
+    writer.join()
+    assert changed.is_set() and repo.by_id == {}
@@ -0,0 +1,46 @@
+def index_of(app, *tasks):
+    index = app.SearchIndex()
+    for task in tasks:
+        index.add(task)
+    return index
+
+def test_search_terms_are_distinct_lowercase_words(app):
+    assert app.search_terms("Fix the LOGIN bug, fix it!") == ("fix", "the", "login", "bug", "it")
+    assert app.search_terms("") == ()
+
+def test_every_term_must_start_some_word(app):
+    index = index_of(
+        app,
+        app.Task("a", "Quarterly report", "numbers for finance"),
+        app.Task("b", "Report bug", "crash on login"),
+        app.Task("c", "Groceries", "milk")
+    )
+    assert index.search(("rep",)) == {"a", "b"}
+    assert index.search(("rep", "fin")) == {"a"}
+    assert index.search(("log", "bug")) == {"b"}
+    # Prefixes only, not the middle of a word
+    assert index.search(("port",)) == set()
+    assert index.matches("a", ("quart", "num"))
+    assert not index.matches("c", ("rep",))
+
+def test_edits_and_deletes_update_the_index(app):
+    repo = app.TaskRepository()
+    index = app.SearchIndex()
+    repo.listeners.append(index.apply_changes)
+    task = app.Task("a", "Draft report", "for the team")
+    repo.add(task)
+    assert index.search(("draft",)) == {"a"}
+
+    repo.update(task, title="Final report")
+    assert index.search(("draft",)) == set()
+    assert index.search(("final", "team")) == {"a"}
+    # Words nobody uses any more leave the prefix vocabulary
+    assert list(index.prefixed("dra")) == []
+
+    repo.delete(task)
+    assert index.search(("rep",)) == set()
+    assert index.postings == {}
+
+def test_one_letter_terms_do_not_filter(app):
+    assert app.query_terms("a Report b re") == ("report", "re")
+    assert app.query_terms("x") == ()
@@ -0,0 +1,180 @@
+import json
+import os
+
+from conftest import make_task
+
+LONG = "old description " * 10
+
+def test_journaled_description_wins_over_snapshot(app, board):
+    path = str(board / "tasks.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([make_task("a", description=LONG), make_task("b", description=LONG)], f, indent=2)
+    store = app.JournalStore(path)
+    store.update("a", {"description": "new description " * 10})
+
+    tasks = {task.id: task for _, batch in store.iter_batches() for _, task, _ in batch}
+    assert tasks["a"].description == "new description " * 10
+    # Untouched tasks still load their description lazily from the snapshot
+    assert tasks["b"].loader is not None
+    assert tasks["b"].description == LONG
+
+def test_binary_counts_come_from_the_index(app, board):
+    store = app.BinaryStore(str(board / "tasks.tpb"))
+    store.write_snapshot([make_task("a"), make_task("b", status="Done"), make_task("c", status="Done")])
+    assert store.count_by_status() == {"Todo": 1, "InProgress": 0, "Done": 2}
+    # Journaled changes are not in the index, the board counts as it loads
+    store.delete("a")
+    assert store.count_by_status() is None
+    assert app.JournalStore(str(board / "tasks.json")).count_by_status() is None
+
+def test_json_store_yields_a_first_batch_per_column(app, board):
+    path = str(board / "tasks.json")
+    statuses = ["Done"] * 30 + ["Todo"] * 12 + ["InProgress"] * 12 + ["Todo"] * 5
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([make_task(f"t{i}", status=status) for i, status in enumerate(statuses)], f)
+    batches = [batch for _, batch in app.JournalStore(path).iter_batches(batch_size=10)]
+
+    first = batches[:3]
+    assert {task.status_name for batch in first for _, task, _ in batch} == {"Todo", "InProgress", "Done"}
+    entries = [entry for batch in batches for entry in batch]
+    assert sorted(seq for seq, _, _ in entries) == list(range(len(statuses)))
+    # Within a column the file order is kept
+    todo = [seq for seq, task, _ in entries if task.status_name == "Todo"]
+    assert todo == sorted(todo)
+
+def test_sqlite_keeps_extra_fields(app, board):
+    tasks = [dict(make_task("a"), labels=["home"], estimate=3), make_task("b")]
+    path = str(board / "tasks.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tasks, f)
+    store = app.SQLiteStore(str(board / "tasks.db"))
+    store.import_json(path)
+    store.update("a", {"labels": ["home", "urgent"], "title": "A"})
+    loaded = {task.id: task.to_dict() for task in store.load()}
+    assert loaded["a"]["labels"] == ["home", "urgent"] and loaded["a"]["estimate"] == 3
+    assert loaded["a"]["title"] == "A"
+    assert "labels" not in loaded["b"]
+    store.close()
+
+def test_open_store_only_migrates_tasks_json_when_asked(app, board):
+    with open(board / "tasks.json", "w", encoding="utf-8") as f:
+        json.dump([make_task("a")], f)
+    store = app.open_store("new.db")
+    assert store.load() == []
+    store.close()
+    store = app.open_store("board.db", migrate=True)
+    assert [task.id for task in store.load()] == ["a"]
+    store.close()
+
+def test_journal_round_trip_and_compaction(app, board):
+    path = str(board / "tasks.json")
+    store = app.JournalStore(path)
+    store.write_snapshot([make_task("a"), make_task("b")])
+    store.apply([("create", None, make_task("c", description=LONG)), ("update", "a", {"status": "Done"}), ("delete", "b", None)])
+    expected = {task["id"]: task for task in [dict(make_task("a"), status="Done"), make_task("c", description=LONG)]}
+
+    assert {task["id"]: task for task in app.JournalStore(path).load_records()} == expected
+    store.compact()
+    assert not os.path.exists(path + app.JOURNAL_SUFFIX)
+    assert {task["id"]: task for task in app.JournalStore(path).load_records()} == expected
+
+def test_torn_journal_record_is_cut(app, board):
+    path = str(board / "tasks.json")
+    store = app.JournalStore(path)
+    store.create(make_task("a"))
+    good_size = os.path.getsize(store.journal_path)
+    # A crash in the middle of an append leaves half a line behind
+    with open(store.journal_path, "ab") as f:
+        f.write(b'{"op": "create", "task": {"id": "b", "ti')
+
+    assert [task["id"] for task in app.JournalStore(path).load_records()] == ["a"]
+    assert os.path.getsize(store.journal_path) == good_size
+    # Records appended afterwards start on a clean line
+    store.create(make_task("c"))
+    assert [task["id"] for task in app.JournalStore(path).load_records()] == ["a", "c"]
+
+def test_append_after_a_torn_record_keeps_new_records(app, board):
+    path = str(board / "tasks.json")
+    app.JournalStore(path).create(make_task("a"))
+    with open(path + app.JOURNAL_SUFFIX, "ab") as f:
+        f.write(b'{"op": "create", "task": {"id": "b", "ti')
+
+    # Imports and the sync store append without loading first
+    app.JournalStore(path).apply([("create", None, make_task(f"n{i}")) for i in range(5)])
+    assert [task["id"] for task in app.JournalStore(path).load_records()] == ["a"] + [f"n{i}" for i in range(5)]
+
+def test_damaged_journal_record_in_the_middle_is_skipped(app, board, capsys):
+    path = str(board / "tasks.json")
+    store = app.JournalStore(path)
+    store.create(make_task("a"))
+    with open(store.journal_path, "ab") as f:
+        f.write(b'{"op": garbage}\n')
+    store.create(make_task("c"))
+    size = os.path.getsize(store.journal_path)
+
+    assert [task["id"] for task in app.JournalStore(path).load_records()] == ["a", "c"]
+    assert os.path.getsize(store.journal_path) == size
+    assert "damaged record" in capsys.readouterr().out
+
+def test_binary_round_trip(app, board):
+    path = str(board / "tasks.tpb")
+    tasks = [
+        make_task("0b0e3a6e-4c3f-4d0e-9a55-2f5e1d6b7c80", title="Ünïcode ✓", description=LONG, priority="Urgent"),
+        dict(make_task("text-id", status="Done"), color="red"),
+        make_task("c", status="InProgress", updated_at="not a date")
+    ]
+    app.BinaryStore(path).write_snapshot(tasks)
+    store = app.BinaryStore(path)
+    loaded = {task["id"]: task for task in store.load_records()}
+    assert loaded["0b0e3a6e-4c3f-4d0e-9a55-2f5e1d6b7c80"] == tasks[0]
+    assert loaded["text-id"]["color"] == "red"
+    assert loaded["c"]["status"] == "InProgress"
+
+    # Streamed tasks read their description from the mapped file on demand
+    streamed = {task.id: task for _, batch in store.iter_batches(batch_size=1) for _, task, _ in batch}
+    assert streamed["0b0e3a6e-4c3f-4d0e-9a55-2f5e1d6b7c80"].description == LONG
+    store.close()
+
+def test_truncated_binary_snapshot_loads_the_journal_only(app, board, capsys):
+    path = str(board / "tasks.tpb")
+    store = app.BinaryStore(path)
+    store.write_snapshot([make_task("a"), make_task("b")])
+    store.create(make_task("c"))
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) // 2)
+
+    store = app.BinaryStore(path)
+    assert [task["id"] for task in store.load_records()] == ["c"]
+    assert [task.id for _, batch in store.iter_batches() for _, task, _ in batch] == ["c"]
+    assert "Error while reading" in capsys.readouterr().out
+    store.close()
+
+def test_descriptions_after_a_rewrite_parse_the_snapshot_once(app, board, monkeypatch):
+    path = str(board / "tasks.json")
+    store = app.JournalStore(path)
+    store.write_snapshot([make_task(f"t{i}", description=f"{LONG} {i}") for i in range(20)])
+    tasks = [task for _, batch in store.iter_batches() for _, task, _ in batch]
+    # A compaction puts the tasks at other offsets
+    store.update("t0", {"title": "A longer title than before"})
+    store.compact()
+    parses = []
+    iter_json_array = app.iter_json_array
+    monkeypatch.setattr(app, "iter_json_array", lambda *args: parses.append(args) or iter_json_array(*args))
+
+    assert [task.description for task in tasks[1:]] == [f"{LONG} {i}" for i in range(1, 20)]
+    assert len(parses) == 1
+
+def test_timestamps_that_do_not_parse_are_saved_as_written(app, board):
+    odd = dict(make_task("a"), created_at="last tuesday", updated_at="")
+    task = app.Task.from_dict(odd)
+    assert task.created_at is None
+    assert task.to_dict() == odd
+    for name in ("tasks.json", "tasks.tpb", "tasks.db"):
+        store = app.open_store(str(board / name))
+        store.write_snapshot([odd])
+        assert [task.to_dict() for task in app.open_store(str(board / name)).load()] == [odd]
+        store.close()
+
+    # A real timestamp replaces it
+    task.created_at = app.parse_timestamp("2024-02-01T08:00:00")
+    assert task.to_dict()["created_at"] == "2024-02-01T08:00:00"
@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+from conftest import make_task
+
+@pytest.fixture
+def server_url(app, board):
+    server = app.make_sync_server(str(board / "server.db"), "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    server.state.close()
+
+def at(app, hour):
+    return app.format_timestamp(app.parse_timestamp(f"2024-01-01T{hour:02d}:00:00"))
+
+def tasks(app, path):
+    store = app.open_store(path)
+    try:
+        return {task.id: task for task in store.load()}
+    finally:
+        store.close()
+
+def change(app, path, changes):
+    store = app.open_store(path)
+    try:
+        app.cli_apply(store, changes)
+    finally:
+        store.close()
+
+def sync(app, path, url):
+    store = app.open_store(path)
+    try:
+        return app.cli_sync(store, url)
+    finally:
+        store.close()
+
+def test_two_replicas_exchange_edits_and_deletes(app, board, server_url):
+    change(app, "a.json", [("create", None, make_task(f"t{i}", updated_at=at(app, 10))) for i in range(3)])
+    assert sync(app, "a.json", server_url) == (3, 0)
+    assert sync(app, "b.json", server_url) == (0, 3)
+    assert set(tasks(app, "b.json")) == {"t0", "t1", "t2"}
+
+    # A renames t0 and deletes t1, B picks up both
+    change(app, "a.json", [("update", "t0", {"title": "renamed", "updated_at": at(app, 11)}), ("delete", "t1", None)])
+    sync(app, "a.json", server_url)
+    sync(app, "b.json", server_url)
+    b = tasks(app, "b.json")
+    assert set(b) == {"t0", "t2"} and b["t0"].title == "renamed"
+
+    # Both edit t2, the later updated_at wins on both sides
+    change(app, "a.json", [("update", "t2", {"title": "from a", "updated_at": at(app, 12)})])
+    change(app, "b.json", [("update", "t2", {"title": "from b", "updated_at": at(app, 13)})])
+    for path in ("a.json", "b.json", "a.json"):
+        sync(app, path, server_url)
+    assert tasks(app, "a.json")["t2"].title == tasks(app, "b.json")["t2"].title == "from b"
+
+    # A deleted task does not come back from a replica that has not seen the delete yet
+    change(app, "b.json", [("delete", "t0", None)])
+    sync(app, "b.json", server_url)
+    sync(app, "a.json", server_url)
+    assert "t0" not in tasks(app, "a.json") and "t0" not in tasks(app, "b.json")
+
+def test_offline_changes_wait_in_the_outbox(app, board, server_url):
+    change(app, "a.json", [("create", None, make_task("t0", updated_at=at(app, 10)))])
+    sync(app, "a.json", server_url)
+    change(app, "a.json", [("update", "t0", {"title": "offline edit", "updated_at": at(app, 11)})])
+
+    offline = app.SyncClient("a.json", "http://127.0.0.1:9", lambda task_id: None, list)
+    offline.sync_quietly()
+    assert offline.last_error
+
+    assert sync(app, "a.json", server_url)[0] == 1
+    assert sync(app, "b.json", server_url) == (0, 1)
+    assert tasks(app, "b.json")["t0"].title == "offline edit"
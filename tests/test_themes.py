@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+def write_theme(board, name, data):
+    path = board / name
+    path.write_bytes(data)
+    return str(path)
+
+@pytest.mark.parametrize("line", ["BACKCOLOR = {[1]: 2}", "BACKCOLOR = (1, ", "BACKCOLOR = " + "[" * 1000 + "]" * 1000])
+def test_bad_values_are_reported_per_line(app, line):
+    values, errors = app.parse_ctheme(f"MENU_NAME = 'Ok'\n{line}\n")
+    assert values == {"MENU_NAME": "Ok"}
+    assert errors == ["line 2: BACKCOLOR is not a valid value"]
+
+def test_find_themes_skips_unreadable_files(app, board, capsys):
+    write_theme(board, "latin1.ctheme", "MENU_NAME = 'Café'\n".encode("latin-1"))
+    write_theme(board, "good.ctheme", b"MENU_NAME = 'Good'\n")
+    assert [theme["name"] for theme in app.find_themes([str(board)])] == ["Good"]
+    assert "latin1.ctheme" in capsys.readouterr().out
+    with pytest.raises(app.THEME_ERRORS):
+        app.load_theme(str(board / "latin1.ctheme"))
+
+def test_parse_ctheme_reads_literals_and_comments(app):
+    values, errors = app.parse_ctheme(
+        "# Night theme\n"
+        "MENU_NAME = 'Night # owl'  # the name keeps its hash\n"
+        "\n"
+        "BACKCOLOR = (10, 20, 30)\n"
+        "CUSTOM.STATUSES = ['Backlog', 'Doing']\n"
+        "COLOR = 'red'\n"
+        "ADD_TO_MENU\n"
+    )
+    assert values == {"MENU_NAME": "Night # owl", "BACKCOLOR": (10, 20, 30), "CUSTOM.STATUSES": ["Backlog", "Doing"]}
+    assert errors == ["line 6: unknown setting 'COLOR'", "line 7: unknown setting 'ADD_TO_MENU'"]
+
+def test_compile_theme_maps_values_to_style_roles(app):
+    errors = []
+    style = app.compile_theme({
+        "BACKCOLOR.GRADIENT": "(0, 0, 0) -> (255, 255, 255)",
+        "CUSTOM.STATUSES": ["Backlog"],
+        "ADD_TO_MENU": False
+    }, "/themes/night.ctheme", errors)
+    assert errors == []
+    assert style["name"] == "night" and style["menu"] is False
+    assert style["window"] == "#000000" and style["header"] == "#ffffff"
+    assert style["column_names"] == ("Backlog", "InProgress", "Done")
+    assert style["card"] == app.DEFAULT_STYLE["card"]
+
+@pytest.mark.parametrize("values", [
+    {"BACKCOLOR": (300, 0, 0)},
+    {"BACKCOLOR": [1, 2, 3]},
+    {"BACKCOLOR.GRADIENT": "(1, 2, 3)"}
+])
+def test_compile_theme_reports_bad_colors(app, values):
+    errors = []
+    style = app.compile_theme(values, "bad.ctheme", errors)
+    assert len(errors) == 1
+    assert style["window"] == app.DEFAULT_STYLE["window"]
+
+def test_load_theme_is_cached_per_file_version(app, board):
+    path = write_theme(board, "night.ctheme", b"BACKCOLOR = 'black'\n")
+    style = app.load_theme(path)
+    assert app.load_theme(path) is style
+    write_theme(board, "night.ctheme", b"BACKCOLOR = 'navy'\n")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert app.load_theme(path)["window"] == "navy"
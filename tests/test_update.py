@@ -0,0 +1,66 @@
+import http.server
+import threading
+
+import pytest
+
+class UpdateServer(http.server.ThreadingHTTPServer):
+    # Serves body with an ETag, answers 304 when the client already has it
+    body = b""
+    etag = '"v1"'
+
+@pytest.fixture
+def server():
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.server.requests.append(dict(self.headers))
+            if self.headers.get("If-None-Match") == self.server.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", self.server.etag)
+            self.send_header("Content-Length", str(len(self.server.body)))
+            self.end_headers()
+            self.wfile.write(self.server.body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = UpdateServer(("127.0.0.1", 0), Handler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def check(app, server, board):
+    return app.check_for_update(
+        url=f"http://127.0.0.1:{server.server_address[1]}/app.py",
+        local_file=str(board / "app.py"),
+        cache_file=str(board / "update_cache.json"),
+        timeout=5
+    )
+
+def test_update_is_downloaded_then_not_modified(app, server, board):
+    (board / "app.py").write_text("VERSION = 1\n")
+    server.body = b"VERSION = 2\n"
+    assert check(app, server, board) == "updated"
+    assert (board / "app.py").read_text() == "VERSION = 2\n"
+
+    # Same file on both sides: a conditional request, answered with 304
+    assert check(app, server, board) == "current"
+    assert server.requests[-1].get("If-None-Match") == server.etag
+    assert not (board / "app.py.download").exists()
+
+def test_same_file_is_current(app, server, board):
+    (board / "app.py").write_text("VERSION = 1\n")
+    server.body = b"VERSION = 1\n"
+    assert check(app, server, board) == "current"
+
+def test_broken_download_leaves_the_file_alone(app, server, board):
+    (board / "app.py").write_text("VERSION = 1\n")
+    server.body = b"def broken(:\n"
+    assert check(app, server, board) == "error"
+    assert (board / "app.py").read_text() == "VERSION = 1\n"
+    assert not (board / "app.py.download").exists()